@@ -1,8 +1,8 @@
 """The Cheapest Energy Windows integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -17,27 +17,20 @@ from .const import (
     EVENT_SETTINGS_ROTATED,
 )
 from .coordinator import CEWCoordinator
-from .services import async_setup_services
+from .services import async_create_notification_automation, async_setup_services
 from .automation_handler import async_setup_automation
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+_BANNER = "=" * 60
+
 # Config entry only integration
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
-async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
-    """Set up the Cheapest Energy Windows component."""
-    # This is called when the component is set up through configuration.yaml
-    # We only support config_flow, so we just return True
-    return True
-
-
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Cheapest Energy Windows from a config entry."""
-    _LOGGER.info("="*60)
-    _LOGGER.info("INTEGRATION SETUP START")
-    _LOGGER.info("="*60)
+    _LOGGER.info("%s\nINTEGRATION SETUP START\n%s", _BANNER, _BANNER)
 
     # Store domain data
     hass.data.setdefault(DOMAIN, {})
@@ -69,44 +62,47 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _LOGGER.info("All platforms set up successfully")
 
-    # NOW do the first coordinator refresh after entities exist
-    _LOGGER.info("Triggering first coordinator refresh")
-    await coordinator.async_config_entry_first_refresh()
-    _LOGGER.info("First coordinator refresh complete")
-
-    # Set up services
-    await async_setup_services(hass)
-
-    # Update automation template (ensures users always have latest features/fixes)
-    from .services import async_create_notification_automation
-    try:
-        success, message = await async_create_notification_automation(hass)
-        if success:
-            _LOGGER.info(f"Automation template updated: {message}")
-        else:
-            _LOGGER.warning(f"Automation template update failed: {message}")
-    except Exception as e:
-        _LOGGER.error(f"Error updating automation template: {e}")
-        # Don't fail setup if automation update fails
-
-    # Set up automation handler
-    automation_handler = await async_setup_automation(hass)
+    # Services, the automation template and the automation handler don't
+    # depend on each other, so set them up concurrently
+    _, _, automation_handler = await asyncio.gather(
+        async_setup_services(hass),
+        _async_update_automation_template(hass),
+        async_setup_automation(hass),
+    )
 
     # Store automation handler for cleanup
     hass.data[DOMAIN][entry.entry_id]["automation_handler"] = automation_handler
 
+    # Entities handle missing coordinator data, so don't hold up setup
+    # waiting for the first refresh
+    _LOGGER.info("Deferring first refresh to background")
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), name="cew_first_refresh"
+    )
+
     # Register update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    _LOGGER.info("="*60)
-    _LOGGER.info("INTEGRATION SETUP COMPLETE")
-    _LOGGER.info("="*60)
+    _LOGGER.info("%s\nINTEGRATION SETUP COMPLETE\n%s", _BANNER, _BANNER)
 
     # Migration from YAML no longer needed - entities are created automatically
 
     return True
 
 
+async def _async_update_automation_template(hass: HomeAssistant) -> None:
+    """Update automation template (ensures users always have latest features/fixes)."""
+    try:
+        success, message = await async_create_notification_automation(hass)
+        if success:
+            _LOGGER.info(f"Automation template updated: {message}")
+        else:
+            _LOGGER.warning(f"Automation template update failed: {message}")
+    except Exception as e:
+        _LOGGER.error(f"Error updating automation template: {e}")
+        # Don't fail setup if automation update fails
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Cheapest Energy Windows integration")
@@ -115,6 +111,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
+        # Cancel pending coordinator refreshes
+        coordinator = hass.data[DOMAIN][entry.entry_id].get("coordinator")
+        if coordinator:
+            await coordinator.async_shutdown()
+
         # Shut down automation handler
         automation_handler = hass.data[DOMAIN][entry.entry_id].get("automation_handler")
         if automation_handler:
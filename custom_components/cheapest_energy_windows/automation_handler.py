@@ -5,8 +5,9 @@ from datetime import datetime, time
 import logging
 from typing import Optional
 
-from homeassistant.const import STATE_ON
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
@@ -19,6 +20,12 @@ from .const import (
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+# States of the cew_today sensor that carry no information
+_IGNORED_STATES = frozenset({STATE_UNKNOWN, STATE_UNAVAILABLE, ""})
+
+# Bursts of cew_today transitions closer together than this are coalesced
+STATE_DEBOUNCE_COOLDOWN = 0.2
+
 
 async def async_setup_automation(hass: HomeAssistant) -> "AutomationHandler":
     """Set up automation handler."""
@@ -30,12 +37,31 @@ async def async_setup_automation(hass: HomeAssistant) -> "AutomationHandler":
 class AutomationHandler:
     """Handles automations for Cheapest Energy Windows."""
 
+    __slots__ = (
+        "hass",
+        "_today_sensor_id",
+        "_state_listener",
+        "_last_state",
+        "_last_meaningful_state",
+        "_pending_new_state",
+        "_state_debouncer",
+    )
+
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the automation handler."""
         self.hass = hass
+        self._today_sensor_id = f"sensor.{PREFIX}today"
         self._state_listener = None
         self._last_state = None
         self._last_meaningful_state = None  # Track last non-unavailable state
+        self._pending_new_state = None
+        self._state_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=STATE_DEBOUNCE_COOLDOWN,
+            immediate=True,
+            function=self._process_latest_state,
+        )
 
     async def async_setup(self) -> None:
         """Set up automation handlers."""
@@ -50,44 +76,65 @@ class AutomationHandler:
             self._state_listener()
             self._state_listener = None
 
+        self._state_debouncer.async_shutdown()
+
         _LOGGER.info("Automation handlers shut down")
 
     async def _setup_state_listener(self) -> None:
         """Set up state change listener for the cew_today sensor."""
+        # The listener only feeds debug logging, nothing else consumes it
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+
         @callback
-        async def state_changed(event):
+        def state_changed(event):
             """Handle state change events."""
+            old_state = event.data.get("old_state")
             new_state = event.data.get("new_state")
-            if not new_state:
-                return
 
-            # Filter out invalid states
-            if new_state.state in ["unknown", "unavailable"]:
+            # Skip attribute-only updates (state hasn't actually changed)
+            if (
+                old_state is not None
+                and new_state is not None
+                and old_state.state == new_state.state
+            ):
                 return
 
-            # Get old state
-            old_state = event.data.get("old_state")
-            old_state_value = old_state.state if old_state else None
-
-            # Skip if state hasn't actually changed
-            if old_state_value == new_state.state:
+            # Filter out removals and invalid states
+            if new_state is None or new_state.state in _IGNORED_STATES:
                 return
 
-            # Track state changes for debugging
-            self._last_state = new_state.state
-            if new_state.state != "unavailable":
-                self._last_meaningful_state = new_state.state
-
-            # Log the state change
-            _LOGGER.debug(
-                f"CEW state changed from {old_state_value} to {new_state.state}"
-            )
+            # Coalesce bursts, only the latest state gets processed
+            self._pending_new_state = new_state
+            self._state_debouncer.async_schedule_call()
 
         # Subscribe to state changes
         self._state_listener = async_track_state_change_event(
             self.hass,
-            f"sensor.{PREFIX}today",
+            self._today_sensor_id,
             state_changed
         )
 
-        _LOGGER.debug("State change listener registered")
\ No newline at end of file
+        _LOGGER.debug("State change listener registered")
+
+    @callback
+    def _process_latest_state(self) -> None:
+        """Process the most recent cew_today state after debouncing."""
+        new_state = self._pending_new_state
+        if new_state is None:
+            return
+        self._pending_new_state = None
+
+        old_state_value = self._last_state
+        if new_state.state == old_state_value:
+            return
+
+        # Track state changes for debugging
+        self._last_state = new_state.state
+        if new_state.state != "unavailable":
+            self._last_meaningful_state = new_state.state
+
+        # Log the state change
+        _LOGGER.debug(
+            f"CEW state changed from {old_state_value} to {new_state.state}"
+        )
@@ -1,9 +1,13 @@
 """Calculation engine for Cheapest Energy Windows."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property, lru_cache
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from numbers import Real
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import numpy as np
 from homeassistant.util import dt as dt_util
@@ -26,20 +30,268 @@ from .const import (
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+_BANNER = "=" * 60
+
+# Slot state codes for the override timeline; discharge codes sort last
+_SLOT_IDLE = 0
+_SLOT_CHARGE = 1
+_SLOT_OFF = 2
+_SLOT_DISCHARGE = 3
+_SLOT_DISCHARGE_AGGRESSIVE = 4
+
+# Sensor state of each slot state code
+_SLOT_STATES = (
+    STATE_IDLE,
+    STATE_CHARGE,
+    STATE_OFF,
+    STATE_DISCHARGE,
+    STATE_DISCHARGE_AGGRESSIVE,
+)
+
+_MODE_TO_SLOT = {
+    MODE_IDLE: _SLOT_IDLE,
+    MODE_CHARGE: _SLOT_CHARGE,
+    MODE_DISCHARGE: _SLOT_DISCHARGE,
+    MODE_DISCHARGE_AGGRESSIVE: _SLOT_DISCHARGE_AGGRESSIVE,
+    MODE_OFF: _SLOT_OFF,
+}
+
+# Result returned when there are no prices to calculate windows from; shared
+# by every empty calculation, so callers must treat results as read-only
+_EMPTY_RESULT: Mapping[str, Any] = MappingProxyType({
+    "state": STATE_OFF,
+    "cheapest_times": [],
+    "cheapest_prices": [],
+    "expensive_times": [],
+    "expensive_prices": [],
+    "expensive_times_aggressive": [],
+    "expensive_prices_aggressive": [],
+    "actual_charge_times": [],
+    "actual_charge_prices": [],
+    "actual_discharge_times": [],
+    "actual_discharge_prices": [],
+    "completed_charge_windows": 0,
+    "completed_discharge_windows": 0,
+    "completed_charge_cost": 0,
+    "completed_discharge_revenue": 0,
+    "num_windows": 0,
+    "min_spread_required": 0,
+    "spread_percentage": 0,
+    "spread_met": False,
+    "spread_avg": 0,
+    "actual_spread_avg": 0,
+    "discharge_spread_met": False,
+    "aggressive_discharge_spread_met": False,
+    "avg_cheap_price": 0,
+    "avg_expensive_price": 0,
+    "current_price": 0,
+    "price_override_active": False,
+    "time_override_active": False,
+    "automation_enabled": False,
+    "calculation_window_enabled": False,
+})
+
+# Slots in a full day of 15-minute prices, the largest common series
+_SLOTS_15M = 96
+
+# Index array for "no windows selected", shared so it must stay read-only
+_NO_WINDOWS = np.empty(0, dtype=np.intp)
+_NO_WINDOWS.setflags(write=False)
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Processed prices as parallel arrays, sorted by timestamp.
+
+    Windows are integer index arrays into a series; slots are only turned
+    back into timestamps and floats when the result is built.
+    """
+
+    timestamps: List[datetime]
+    price: np.ndarray  # float64; thresholds and costs are compared against it
+    epoch: np.ndarray  # float64 start as seconds since the Unix epoch
+    minute_of_day: np.ndarray  # int16 local wall-clock start, minutes since midnight
+    duration: int  # Slot length in minutes, the same for every slot
+
+    def __len__(self) -> int:
+        """Return the number of price slots."""
+        return len(self.timestamps)
+
+    def take(self, indices: np.ndarray) -> PriceSeries:
+        """Return a series holding only the given slots."""
+        return PriceSeries(
+            timestamps=[self.timestamps[i] for i in indices.tolist()],
+            price=self.price[indices],
+            epoch=self.epoch[indices],
+            minute_of_day=self.minute_of_day[indices],
+            duration=self.duration,
+        )
+
+    @cached_property
+    def iso_times(self) -> List[str]:
+        """Return the ISO start time of every slot.
+
+        The series is reused across recalculations by the window plan, so
+        each start is only formatted once.
+        """
+        return [ts.isoformat() for ts in self.timestamps]
+
+    def times_and_prices(self, indices: np.ndarray) -> Tuple[List[str], List[float]]:
+        """Return the ISO start times and prices of the given slots."""
+        return (
+            list(map(self.iso_times.__getitem__, indices.tolist())),
+            self.price[indices].tolist(),
+        )
+
+
+@dataclass(frozen=True)
+class PriceStats:
+    """Percentile statistics over all processed prices."""
+
+    cheap_threshold: float  # cheap_percentile of prices
+    expensive_threshold: float  # 100 - expensive_percentile of prices
+    expensive_avg: float  # Average above the 100 - cheap_percentile
+    cheap_avg: float  # Average below the expensive_percentile
+
+
+def _percentiles(values: np.ndarray, percentiles: Tuple[float, ...]) -> List[float]:
+    """Return linearly interpolated percentiles of values.
+
+    Gives the same results as np.percentile, but selects only the
+    interpolation neighbours with a single np.partition instead of sorting.
+    """
+    last = values.size - 1
+    positions = []
+    kth = {last}  # Also places any NaN last, which poisons every percentile
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError("Percentiles must be in the range [0, 100]")
+        position = last * (percentile / 100)
+        positions.append(position)
+        if position < last:
+            kth.update((int(position), int(position) + 1))
+
+    partitioned = np.partition(values, list(kth))
+    if np.isnan(partitioned[last]):
+        return [float("nan")] * len(positions)
+
+    result = []
+    for position in positions:
+        if position >= last:
+            result.append(float(partitioned[last]))
+            continue
+        lower = int(position)
+        below = float(partitioned[lower])
+        above = float(partitioned[lower + 1])
+        gamma = position - lower
+        diff = above - below
+        # Same two-sided interpolation as NumPy's, for identical rounding
+        if gamma >= 0.5:
+            result.append(above - diff * (1 - gamma))
+        else:
+            result.append(below + diff * gamma)
+    return result
+
+
+@lru_cache(maxsize=512)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a (possibly quoted) ISO timestamp string.
+
+    Price sensors repeat the same start strings on every update, so the
+    parsed datetimes are cached. Offsets are kept, unlike datetime64.
+    """
+    return datetime.fromisoformat(value.replace('"', ''))
+
+
+@lru_cache(maxsize=32)
+def _parse_time_of_day(value: str) -> Optional[Tuple[int, int]]:
+    """Parse an HH:MM:SS string into (hour, minute), or None if unparsable."""
+    try:
+        parts = value.split(":")
+        return int(parts[0]), int(parts[1])
+    except (ValueError, IndexError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=32)
+def _parse_time_range(start_str: str, end_str: str) -> Optional[Tuple[int, int]]:
+    """Parse a time override range into minutes since midnight.
+
+    Returns None when either end is unparsable or not a valid time of day.
+    """
+    start = _parse_time_of_day(start_str)
+    end = _parse_time_of_day(end_str)
+    if start is None or end is None:
+        return None
+    if not (0 <= start[0] <= 23 and 0 <= start[1] <= 59 and 0 <= end[0] <= 23 and 0 <= end[1] <= 59):
+        return None
+    return start[0] * 60 + start[1], end[0] * 60 + end[1]
+
+
+def _select_windows(
+    candidates: np.ndarray,
+    candidate_prices: np.ndarray,
+    num_windows: int,
+    opposite_avg: float,
+    min_spread: float,
+    min_price_diff: float,
+    charging: bool,
+) -> np.ndarray:
+    """Progressively select windows while the spread requirements still hold.
+
+    Candidates come best first. Each one is tested against the average of
+    the windows selected so far plus itself, compared with opposite_avg
+    (the expensive average when charging, the cheap average when
+    discharging). Candidates failing the test are skipped.
+    """
+    selected = []
+    selected_sum = 0.0
+
+    # Plain Python floats, a running sum avoids re-averaging the selection
+    for candidate, price in zip(candidates.tolist(), candidate_prices.tolist()):
+        if len(selected) >= num_windows:
+            break
+
+        # Test spread with this window
+        selection_avg = (selected_sum + price) / (len(selected) + 1)
+        if charging:
+            cheap_avg, expensive_avg = selection_avg, opposite_avg
+        else:
+            cheap_avg, expensive_avg = opposite_avg, selection_avg
+
+        # Calculate spread percentage
+        if cheap_avg > 0:
+            spread_pct = ((expensive_avg - cheap_avg) / cheap_avg) * 100
+            price_diff = expensive_avg - cheap_avg
+
+            if spread_pct >= min_spread and price_diff >= min_price_diff:
+                selected.append(candidate)
+                selected_sum += price
+
+    return np.asarray(selected, dtype=np.intp)
+
+
+def _mean_or_nan(values: np.ndarray) -> float:
+    """Return the mean of values, or NaN without a warning when empty."""
+    return float(values.mean()) if values.size else float("nan")
+
 
 class WindowCalculationEngine:
     """High-performance window selection engine."""
 
     def __init__(self) -> None:
         """Initialize the calculation engine."""
-        pass
+        # Last window plan per day: is_tomorrow -> (plan key, raw prices, plan)
+        self._plans: Dict[bool, Tuple[tuple, List[Dict[str, Any]], Any]] = {}
+        # Scratch slot states for the override timeline, grown on demand
+        self._state_buf = np.empty(_SLOTS_15M, dtype=np.int8)
 
     def calculate_windows(
         self,
         raw_prices: List[Dict[str, Any]],
         config: Dict[str, Any],
         is_tomorrow: bool = False
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Calculate optimal charging/discharging windows.
 
         Args:
@@ -48,14 +300,16 @@ class WindowCalculationEngine:
             is_tomorrow: Whether calculating for tomorrow
 
         Returns:
-            Dictionary with calculated windows and attributes
+            Dictionary with calculated windows and attributes; read-only
         """
         # Debug logging for calculation window
-        _LOGGER.debug(f"=== CALCULATION ENGINE CALLED for {'tomorrow' if is_tomorrow else 'today'} ===")
-        _LOGGER.debug(f"Config keys received: {list(config.keys())}")
-        _LOGGER.debug(f"calculation_window_enabled in config: {config.get('calculation_window_enabled', 'NOT PRESENT')}")
-        _LOGGER.debug(f"calculation_window_start: {config.get('calculation_window_start', 'NOT PRESENT')}")
-        _LOGGER.debug(f"calculation_window_end: {config.get('calculation_window_end', 'NOT PRESENT')}")
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("=== CALCULATION ENGINE CALLED for %s ===", "tomorrow" if is_tomorrow else "today")
+            _LOGGER.debug("Config keys received: %s", list(config))
+            _LOGGER.debug("calculation_window_enabled in config: %s", config.get("calculation_window_enabled", "NOT PRESENT"))
+            _LOGGER.debug("calculation_window_start: %s", config.get("calculation_window_start", "NOT PRESENT"))
+            _LOGGER.debug("calculation_window_end: %s", config.get("calculation_window_end", "NOT PRESENT"))
 
         # Get configuration values
         pricing_mode = config.get("pricing_window_duration", PRICING_15_MINUTES)
@@ -77,88 +331,158 @@ class WindowCalculationEngine:
         tax = config.get("tax", 0.12286)
         additional_cost = config.get("additional_cost", 0.02398)
 
+        # Apply calculation window filter if enabled (use suffix for tomorrow settings)
+        calc_window = None
+        if config.get(f"calculation_window_enabled{suffix}", False):
+            calc_window = (
+                config.get(f"calculation_window_start{suffix}", "00:00:00"),
+                config.get(f"calculation_window_end{suffix}", "23:59:59"),
+            )
+
+        # Everything up to window selection is independent of the current
+        # time, so reuse it while prices and settings are unchanged
+        plan_key = (
+            pricing_mode,
+            vat,
+            tax,
+            additional_cost,
+            calc_window,
+            num_charge_windows,
+            num_discharge_windows,
+            cheap_percentile,
+            expensive_percentile,
+            min_spread,
+            min_spread_discharge,
+            aggressive_spread,
+            min_price_diff,
+        )
+        cached = self._plans.get(is_tomorrow)
+        if cached is not None and cached[0] == plan_key and cached[1] == raw_prices:
+            plan = cached[2]
+        else:
+            plan = self._plan_windows(raw_prices, *plan_key)
+            self._plans[is_tomorrow] = (plan_key, list(raw_prices), plan)
+
+        if plan is None:
+            return self._empty_result()
+
+        series, charge_windows, discharge_windows, aggressive_windows, scheduled_states = plan
+
+        # Calculate current state
+        current_state = self._determine_current_state(
+            series,
+            scheduled_states,
+            config
+        )
+
+        # Build result
+        result = self._build_result(
+            series,
+            charge_windows,
+            discharge_windows,
+            aggressive_windows,
+            scheduled_states,
+            current_state,
+            config,
+            is_tomorrow
+        )
+
+        return result
+
+    def _plan_windows(
+        self,
+        raw_prices: List[Dict[str, Any]],
+        pricing_mode: str,
+        vat: float,
+        tax: float,
+        additional_cost: float,
+        calc_window: Optional[Tuple[str, str]],
+        num_charge_windows: int,
+        num_discharge_windows: int,
+        cheap_percentile: float,
+        expensive_percentile: float,
+        min_spread: float,
+        min_spread_discharge: float,
+        aggressive_spread: float,
+        min_price_diff: float
+    ) -> Optional[Tuple[PriceSeries, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Process prices and select the calculated windows.
+
+        Returns (series, charge, discharge, aggressive windows, scheduled
+        slot states), or None when there are no prices to calculate on.
+        """
         # Process prices based on mode
-        processed_prices = self._process_prices(
+        series = self._process_prices(
             raw_prices, pricing_mode, vat, tax, additional_cost
         )
 
-        if not processed_prices:
+        if not series:
             _LOGGER.debug("No prices to process")
-            return self._empty_result(is_tomorrow)
-
-        # Apply calculation window filter if enabled (use suffix for tomorrow settings)
-        calc_window_enabled = config.get(f"calculation_window_enabled{suffix}", False)
-        if calc_window_enabled:
-            calc_window_start = config.get(f"calculation_window_start{suffix}", "00:00:00")
-            calc_window_end = config.get(f"calculation_window_end{suffix}", "23:59:59")
-            _LOGGER.debug(f"Calculation window ENABLED: {calc_window_start} - {calc_window_end}, filtering {len(processed_prices)} prices")
-            processed_prices = self._filter_prices_by_calculation_window(
-                processed_prices,
+            return None
+
+        # Apply calculation window filter if enabled
+        if calc_window is not None:
+            calc_window_start, calc_window_end = calc_window
+            _LOGGER.debug("Calculation window ENABLED: %s - %s, filtering %d prices", calc_window_start, calc_window_end, len(series))
+            series = self._filter_prices_by_calculation_window(
+                series,
                 calc_window_start,
                 calc_window_end
             )
-            _LOGGER.debug(f"After calculation window filter: {len(processed_prices)} prices remain")
-            if not processed_prices:
+            _LOGGER.debug("After calculation window filter: %d prices remain", len(series))
+            if not series:
                 _LOGGER.debug("No prices after calculation window filter")
-                return self._empty_result(is_tomorrow)
+                return None
         else:
             _LOGGER.debug("Calculation window disabled")
 
+        # Price statistics shared by the window finders
+        stats = self._compute_price_stats(series.price, cheap_percentile, expensive_percentile)
+
         # Find windows
         charge_windows = self._find_charge_windows(
-            processed_prices,
+            series,
             num_charge_windows,
-            cheap_percentile,
+            stats,
             min_spread,
             min_price_diff
         )
 
         discharge_windows = self._find_discharge_windows(
-            processed_prices,
+            series,
             charge_windows,
             num_discharge_windows,
             expensive_percentile,
+            stats,
             min_spread_discharge,
             min_price_diff
         )
 
         aggressive_windows = self._find_aggressive_discharge_windows(
-            processed_prices,
+            series,
             charge_windows,
             discharge_windows,
             num_discharge_windows,
-            expensive_percentile,
+            stats,
             aggressive_spread,
             min_price_diff
         )
 
         # Debug output when calculation window is enabled
-        if calc_window_enabled:
-            charge_times = [w["timestamp"].strftime("%H:%M") for w in charge_windows]
-            discharge_times = [w["timestamp"].strftime("%H:%M") for w in discharge_windows]
-            _LOGGER.debug(f"After calculation window filter - Charge windows: {charge_times}, Discharge windows: {discharge_times}")
+        if calc_window is not None and _LOGGER.isEnabledFor(logging.DEBUG):
+            charge_times = [series.timestamps[i].strftime("%H:%M") for i in charge_windows]
+            discharge_times = [series.timestamps[i].strftime("%H:%M") for i in discharge_windows]
+            _LOGGER.debug("After calculation window filter - Charge windows: %s, Discharge windows: %s", charge_times, discharge_times)
 
-        # Calculate current state
-        current_state = self._determine_current_state(
-            processed_prices,
-            charge_windows,
-            discharge_windows,
-            aggressive_windows,
-            config
-        )
+        # Slot state codes from the calculated windows alone. Later
+        # assignments win: aggressive over discharge over charge. Windows
+        # are slots of this same series, so they index it directly.
+        scheduled_states = np.full(len(series), _SLOT_IDLE, dtype=np.int8)
+        scheduled_states[charge_windows] = _SLOT_CHARGE
+        scheduled_states[discharge_windows] = _SLOT_DISCHARGE
+        scheduled_states[aggressive_windows] = _SLOT_DISCHARGE_AGGRESSIVE
 
-        # Build result
-        result = self._build_result(
-            processed_prices,
-            charge_windows,
-            discharge_windows,
-            aggressive_windows,
-            current_state,
-            config,
-            is_tomorrow
-        )
-
-        return result
+        return series, charge_windows, discharge_windows, aggressive_windows, scheduled_states
 
     def _process_prices(
         self,
@@ -167,133 +491,125 @@ class WindowCalculationEngine:
         vat: float,
         tax: float,
         additional_cost: float
-    ) -> List[Dict[str, Any]]:
+    ) -> PriceSeries:
         """Process raw prices with VAT, tax, and additional costs."""
-        _LOGGER.debug("="*60)
-        _LOGGER.debug("PROCESS PRICES START")
-        _LOGGER.debug(f"Raw prices type: {type(raw_prices)}")
-        _LOGGER.debug(f"Raw prices length: {len(raw_prices) if hasattr(raw_prices, '__len__') else 'N/A'}")
-        _LOGGER.debug(f"Pricing mode: {pricing_mode}")
-        _LOGGER.debug(f"VAT: {vat} (type: {type(vat)})")
-        _LOGGER.debug(f"Tax: {tax} (type: {type(tax)})")
-        _LOGGER.debug(f"Additional cost: {additional_cost} (type: {type(additional_cost)})")
-
-        if raw_prices and len(raw_prices) > 0:
-            _LOGGER.debug(f"First item type: {type(raw_prices[0])}")
-            _LOGGER.debug(f"First item: {raw_prices[0]}")
-            if len(raw_prices) > 1:
-                _LOGGER.debug(f"Second item: {raw_prices[1]}")
-
-        processed = []
-
-        if pricing_mode == PRICING_1_HOUR:
-            # Group by hour and average
-            hourly_prices = {}
-            for item in raw_prices:
-                try:
-                    # Validate item is a dict
-                    if not isinstance(item, dict):
-                        _LOGGER.error(f"Item is not a dict! Type: {type(item)}, Value: {item}")
-                        continue
-
-                    # Parse timestamp - handle both datetime objects and strings
-                    start_value = item.get("start")
-                    if not start_value:
-                        _LOGGER.warning(f"Item has no 'start' key: {item}")
-                        continue
-
-                    if isinstance(start_value, datetime):
-                        # Already a datetime object (new Nordpool format)
-                        timestamp = start_value
-                    elif isinstance(start_value, str):
-                        # String format (old format)
-                        timestamp_str = start_value.replace('"', '')
-                        timestamp = datetime.fromisoformat(timestamp_str)
-                    else:
-                        _LOGGER.error(f"Unexpected start type: {type(start_value)}, Value: {start_value}")
-                        continue
-
-                    hour = timestamp.replace(minute=0, second=0, microsecond=0)
-
-                    if hour not in hourly_prices:
-                        hourly_prices[hour] = []
-
-                    # Calculate total price
-                    base_price = item.get("value", 0)
-                    total_price = (base_price * (1 + vat)) + tax + additional_cost
-                    hourly_prices[hour].append(total_price)
-
-                except (ValueError, TypeError, AttributeError) as e:
-                    _LOGGER.error(f"Failed to process price item: {e}", exc_info=True)
-                    _LOGGER.error(f"Problematic item: {item}")
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug(_BANNER)
+            _LOGGER.debug("PROCESS PRICES START")
+            _LOGGER.debug("Raw prices type: %s", type(raw_prices))
+            _LOGGER.debug("Raw prices length: %s", len(raw_prices) if hasattr(raw_prices, "__len__") else "N/A")
+            _LOGGER.debug("Pricing mode: %s", pricing_mode)
+            _LOGGER.debug("VAT: %s (type: %s)", vat, type(vat))
+            _LOGGER.debug("Tax: %s (type: %s)", tax, type(tax))
+            _LOGGER.debug("Additional cost: %s (type: %s)", additional_cost, type(additional_cost))
+
+            if raw_prices and len(raw_prices) > 0:
+                _LOGGER.debug("First item type: %s", type(raw_prices[0]))
+                _LOGGER.debug("First item: %s", raw_prices[0])
+                if len(raw_prices) > 1:
+                    _LOGGER.debug("Second item: %s", raw_prices[1])
+
+        # Validate and parse items once, price maths is vectorized below
+        timestamps = []
+        base_prices = []
+        for item in raw_prices:
+            try:
+                # Validate item is a dict
+                if not isinstance(item, dict):
+                    _LOGGER.error("Item is not a dict! Type: %s, Value: %s", type(item), item)
                     continue
 
-            # Average hourly prices
-            for hour, prices in hourly_prices.items():
-                if prices:
-                    processed.append({
-                        "timestamp": hour,
-                        "price": float(np.mean(prices)),  # Convert numpy.float64 to Python float
-                        "duration": 60  # 60 minutes
-                    })
+                # Parse timestamp - handle both datetime objects and strings
+                start_value = item.get("start")
+                if not start_value:
+                    _LOGGER.warning("Item has no 'start' key: %s", item)
+                    continue
 
-        else:  # 15-minute mode
-            for item in raw_prices:
-                try:
-                    # Validate item is a dict
-                    if not isinstance(item, dict):
-                        _LOGGER.error(f"Item is not a dict! Type: {type(item)}, Value: {item}")
-                        continue
-
-                    # Parse timestamp - handle both datetime objects and strings
-                    start_value = item.get("start")
-                    if not start_value:
-                        _LOGGER.warning(f"Item has no 'start' key: {item}")
-                        continue
-
-                    if isinstance(start_value, datetime):
-                        # Already a datetime object (new Nordpool format)
-                        timestamp = start_value
-                    elif isinstance(start_value, str):
-                        # String format (old format)
-                        timestamp_str = start_value.replace('"', '')
-                        timestamp = datetime.fromisoformat(timestamp_str)
-                    else:
-                        _LOGGER.error(f"Unexpected start type: {type(start_value)}, Value: {start_value}")
-                        continue
-
-                    base_price = item.get("value", 0)
-                    total_price = (base_price * (1 + vat)) + tax + additional_cost
-
-                    processed.append({
-                        "timestamp": timestamp,
-                        "price": total_price,
-                        "duration": 15  # 15 minutes
-                    })
-
-                except (ValueError, TypeError, AttributeError) as e:
-                    _LOGGER.error(f"Failed to process price item: {e}", exc_info=True)
-                    _LOGGER.error(f"Problematic item: {item}")
+                if isinstance(start_value, datetime):
+                    # Already a datetime object (new Nordpool format)
+                    timestamp = start_value
+                elif isinstance(start_value, str):
+                    # String format (old format)
+                    timestamp = _parse_timestamp(start_value)
+                else:
+                    _LOGGER.error("Unexpected start type: %s, Value: %s", type(start_value), start_value)
                     continue
 
-        # Sort by timestamp
-        processed.sort(key=lambda x: x["timestamp"])
+                base_price = item.get("value", 0)
+                if not isinstance(base_price, Real):
+                    raise TypeError(f"Unsupported price value type: {type(base_price)}")
+
+            except (ValueError, TypeError, AttributeError) as e:
+                _LOGGER.error("Failed to process price item: %s", e, exc_info=True)
+                _LOGGER.error("Problematic item: %s", item)
+                continue
+
+            timestamps.append(timestamp)
+            base_prices.append(base_price)
+
+        # Calculate total prices in one pass
+        totals = np.asarray(base_prices, dtype=np.float64) * (1 + vat) + tax + additional_cost
+
+        epoch = np.fromiter(
+            (ts.timestamp() for ts in timestamps),
+            dtype=np.float64,
+            count=len(timestamps),
+        )
+
+        if pricing_mode == PRICING_1_HOUR:
+            # Group by hour and average. An hour starts at the slot start minus
+            # its wall-clock offset into the hour (whole seconds, so rint
+            # absorbs float error from sub-second starts)
+            into_hour = np.fromiter(
+                (ts.minute * 60 + ts.second + ts.microsecond / 1e6 for ts in timestamps),
+                dtype=np.float64,
+                count=len(timestamps),
+            )
+            epoch, first, group = np.unique(
+                np.rint(epoch - into_hour), return_index=True, return_inverse=True
+            )
+            totals = np.bincount(group, weights=totals, minlength=epoch.size) / np.bincount(
+                group, minlength=epoch.size
+            )
+            timestamps = [
+                timestamps[i].replace(minute=0, second=0, microsecond=0) for i in first.tolist()
+            ]
+            duration = 60  # 60 minutes
+        else:  # 15-minute mode
+            duration = 15  # 15 minutes
+
+        # Sort by start instant; stable, so equal starts keep their input order
+        order = np.argsort(epoch, kind="stable")
+        timestamps = [timestamps[i] for i in order.tolist()]
+        processed = PriceSeries(
+            timestamps=timestamps,
+            price=totals[order],
+            epoch=epoch[order],
+            minute_of_day=np.fromiter(
+                (ts.hour * 60 + ts.minute for ts in timestamps),
+                dtype=np.int16,
+                count=len(timestamps),
+            ),
+            duration=duration,
+        )
 
-        _LOGGER.debug(f"Processed {len(processed)} price entries")
-        if processed:
-            _LOGGER.debug(f"First processed price: {processed[0]}")
-            _LOGGER.debug(f"Last processed price: {processed[-1]}")
-        _LOGGER.debug("PROCESS PRICES END")
-        _LOGGER.debug("="*60)
+        if debug:
+            _LOGGER.debug("Processed %d price entries", len(processed))
+            if processed:
+                _LOGGER.debug("First processed price: %s %s", processed.timestamps[0], processed.price[0])
+                _LOGGER.debug("Last processed price: %s %s", processed.timestamps[-1], processed.price[-1])
+            _LOGGER.debug("PROCESS PRICES END")
+            _LOGGER.debug(_BANNER)
 
         return processed
 
     def _filter_prices_by_calculation_window(
         self,
-        prices: List[Dict[str, Any]],
+        prices: PriceSeries,
         start_str: str,
         end_str: str
-    ) -> List[Dict[str, Any]]:
+    ) -> PriceSeries:
         """Filter prices to only include those within the calculation window time range.
 
         This restricts the price analysis to a specific time window each day.
@@ -303,214 +619,162 @@ class WindowCalculationEngine:
         if not prices:
             return prices
 
-        filtered = []
-
-        try:
-            # Parse time strings (HH:MM:SS format)
-            start_parts = start_str.split(":")
-            end_parts = end_str.split(":")
-
-            start_hour = int(start_parts[0])
-            start_minute = int(start_parts[1])
-            end_hour = int(end_parts[0])
-            end_minute = int(end_parts[1])
-
-            for price_data in prices:
-                timestamp = price_data["timestamp"]
-                price_hour = timestamp.hour
-                price_minute = timestamp.minute
-
-                # Convert to minutes since midnight for easier comparison
-                price_time = price_hour * 60 + price_minute
-                start_time = start_hour * 60 + start_minute
-                end_time = end_hour * 60 + end_minute
-
-                # Handle overnight periods
-                if end_time < start_time:
-                    # Overnight: include if time >= start OR time < end
-                    if price_time >= start_time or price_time < end_time:
-                        filtered.append(price_data)
-                else:
-                    # Same day: include if start <= time < end
-                    if start_time <= price_time < end_time:
-                        filtered.append(price_data)
+        start = _parse_time_of_day(start_str)
+        end = _parse_time_of_day(end_str)
+        if start is None or end is None:
+            _LOGGER.error("Failed to parse calculation window times: %s - %s", start_str, end_str)
+            return prices  # Return unfiltered on error
 
-            _LOGGER.debug(f"Calculation window filter: {len(prices)} -> {len(filtered)} prices (window: {start_str} to {end_str})")
+        # Convert to minutes since midnight for easier comparison
+        start_time = start[0] * 60 + start[1]
+        end_time = end[0] * 60 + end[1]
 
-        except (ValueError, IndexError, AttributeError) as e:
-            _LOGGER.error(f"Failed to parse calculation window times: {e}")
-            return prices  # Return unfiltered on error
+        price_time = prices.minute_of_day
+
+        # Handle overnight periods
+        if end_time < start_time:
+            # Overnight: include if time >= start OR time < end
+            keep = (price_time >= start_time) | (price_time < end_time)
+        else:
+            # Same day: include if start <= time < end
+            keep = (price_time >= start_time) & (price_time < end_time)
+
+        filtered = prices.take(np.flatnonzero(keep))
+        _LOGGER.debug("Calculation window filter: %d -> %d prices (window: %s to %s)", len(prices), len(filtered), start_str, end_str)
 
         return filtered
 
+    def _compute_price_stats(
+        self,
+        price_array: np.ndarray,
+        cheap_percentile: float,
+        expensive_percentile: float
+    ) -> PriceStats:
+        """Compute the percentile thresholds and averages used by the window finders."""
+        cheap_threshold, expensive_cutoff, expensive_threshold, cheap_cutoff = _percentiles(
+            price_array,
+            (cheap_percentile, 100 - cheap_percentile, 100 - expensive_percentile, expensive_percentile),
+        )
+
+        return PriceStats(
+            cheap_threshold=cheap_threshold,
+            expensive_threshold=expensive_threshold,
+            expensive_avg=_mean_or_nan(price_array[price_array > expensive_cutoff]),
+            cheap_avg=_mean_or_nan(price_array[price_array < cheap_cutoff]),
+        )
+
     def _find_charge_windows(
         self,
-        prices: List[Dict[str, Any]],
+        prices: PriceSeries,
         num_windows: int,
-        cheap_percentile: float,
+        stats: PriceStats,
         min_spread: float,
         min_price_diff: float
-    ) -> List[Dict[str, Any]]:
+    ) -> np.ndarray:
         """Find cheapest windows for charging."""
         if not prices or num_windows <= 0:
-            return []
-
-        # Convert to numpy array for efficient operations
-        price_array = np.array([p["price"] for p in prices])
-
-        # Calculate percentile threshold
-        cheap_threshold = np.percentile(price_array, cheap_percentile)
+            return _NO_WINDOWS
 
-        # Get candidates below threshold
-        candidates = []
-        for i, price_data in enumerate(prices):
-            if price_data["price"] <= cheap_threshold:
-                candidates.append({
-                    "index": i,
-                    "timestamp": price_data["timestamp"],
-                    "price": price_data["price"],
-                    "duration": price_data["duration"]
-                })
+        price_array = prices.price
 
-        # Sort by price
-        candidates.sort(key=lambda x: x["price"])
+        # Get candidates below threshold, sorted by price (stable keeps time order on ties)
+        candidates = np.flatnonzero(price_array <= stats.cheap_threshold)
+        candidates = candidates[np.argsort(price_array[candidates], kind="stable")]
 
         # Progressive selection with spread check
-        selected = []
-        expensive_avg = np.mean(price_array[price_array > np.percentile(price_array, 100 - cheap_percentile)])
-
-        for candidate in candidates:
-            if len(selected) >= num_windows:
-                break
-
-            # Test spread with this window
-            test_prices = [s["price"] for s in selected] + [candidate["price"]]
-            cheap_avg = np.mean(test_prices)
-
-            # Calculate spread percentage
-            if cheap_avg > 0:
-                spread_pct = ((expensive_avg - cheap_avg) / cheap_avg) * 100
-                price_diff = expensive_avg - cheap_avg
-
-                if spread_pct >= min_spread and price_diff >= min_price_diff:
-                    selected.append(candidate)
-
-        return selected
+        return _select_windows(
+            candidates,
+            price_array[candidates],
+            num_windows,
+            stats.expensive_avg,
+            min_spread,
+            min_price_diff,
+            charging=True,
+        )
 
     def _find_discharge_windows(
         self,
-        prices: List[Dict[str, Any]],
-        charge_windows: List[Dict[str, Any]],
+        prices: PriceSeries,
+        charge_windows: np.ndarray,
         num_windows: int,
         expensive_percentile: float,
+        stats: PriceStats,
         min_spread: float,
         min_price_diff: float
-    ) -> List[Dict[str, Any]]:
+    ) -> np.ndarray:
         """Find expensive windows for discharging."""
         if not prices or num_windows <= 0:
-            return []
+            return _NO_WINDOWS
 
         # Exclude charging times
-        charge_indices = {w["index"] for w in charge_windows}
-
-        # Filter out charging windows
-        available_prices = []
-        for i, price_data in enumerate(prices):
-            if i not in charge_indices:
-                available_prices.append({
-                    "index": i,
-                    "timestamp": price_data["timestamp"],
-                    "price": price_data["price"],
-                    "duration": price_data["duration"]
-                })
-
-        if not available_prices:
-            return []
+        excluded = np.zeros(len(prices), dtype=bool)
+        excluded[charge_windows] = True
+        available = np.flatnonzero(~excluded)
 
-        # Convert to numpy array
-        price_array = np.array([p["price"] for p in available_prices])
+        if not available.size:
+            return _NO_WINDOWS
 
-        # Calculate percentile threshold
-        expensive_threshold = np.percentile(price_array, 100 - expensive_percentile)
+        price_array = prices.price[available]
 
-        # Get candidates above threshold
-        candidates = []
-        for price_data in available_prices:
-            if price_data["price"] >= expensive_threshold:
-                candidates.append(price_data)
-
-        # Sort by price (descending for discharge)
-        candidates.sort(key=lambda x: x["price"], reverse=True)
-
-        # Progressive selection with spread check
-        selected = []
-        if charge_windows:
-            cheap_avg = np.mean([w["price"] for w in charge_windows])
+        # Calculate percentile threshold, the shared one covers all prices
+        # and only applies while no charge windows are excluded
+        if charge_windows.size:
+            expensive_threshold = _percentiles(price_array, (100 - expensive_percentile,))[0]
         else:
-            cheap_avg = np.mean(price_array[price_array < np.percentile(price_array, expensive_percentile)])
+            expensive_threshold = stats.expensive_threshold
 
-        for candidate in candidates:
-            if len(selected) >= num_windows:
-                break
+        # Get candidates above threshold, sorted by price (descending for discharge)
+        above = price_array >= expensive_threshold
+        candidates = available[above][np.argsort(-price_array[above], kind="stable")]
 
-            # If no charge windows, skip spread check and just select top expensive windows
-            if not charge_windows:
-                selected.append(candidate)
-                continue
-
-            # Test spread with this window
-            test_prices = [s["price"] for s in selected] + [candidate["price"]]
-            expensive_avg = np.mean(test_prices)
+        # If no charge windows, skip spread check and just select top expensive windows
+        if not charge_windows.size:
+            return candidates[:num_windows]
 
-            # Calculate spread percentage
-            if cheap_avg > 0:
-                spread_pct = ((expensive_avg - cheap_avg) / cheap_avg) * 100
-                price_diff = expensive_avg - cheap_avg
-
-                if spread_pct >= min_spread and price_diff >= min_price_diff:
-                    selected.append(candidate)
-
-        return selected
+        # Progressive selection with spread check
+        return _select_windows(
+            candidates,
+            prices.price[candidates],
+            num_windows,
+            float(np.mean(prices.price[charge_windows])),
+            min_spread,
+            min_price_diff,
+            charging=False,
+        )
 
     def _find_aggressive_discharge_windows(
         self,
-        prices: List[Dict[str, Any]],
-        charge_windows: List[Dict[str, Any]],
-        discharge_windows: List[Dict[str, Any]],
+        prices: PriceSeries,
+        charge_windows: np.ndarray,
+        discharge_windows: np.ndarray,
         num_windows: int,
-        expensive_percentile: float,
+        stats: PriceStats,
         aggressive_spread: float,
         min_price_diff: float
-    ) -> List[Dict[str, Any]]:
+    ) -> np.ndarray:
         """Find windows for aggressive discharge (peak prices)."""
         if not prices or num_windows <= 0:
-            return []
+            return _NO_WINDOWS
 
         # Use discharge windows as base, filter by aggressive spread
-        candidates = []
-
-        if charge_windows:
-            cheap_avg = np.mean([w["price"] for w in charge_windows])
+        if charge_windows.size:
+            cheap_avg = np.mean(prices.price[charge_windows])
         else:
-            price_array = np.array([p["price"] for p in prices])
-            cheap_avg = np.mean(price_array[price_array < np.percentile(price_array, expensive_percentile)])
+            cheap_avg = stats.cheap_avg
 
-        for window in discharge_windows:
-            if cheap_avg > 0:
-                spread_pct = ((window["price"] - cheap_avg) / cheap_avg) * 100
-                price_diff = window["price"] - cheap_avg
+        if not cheap_avg > 0:
+            return _NO_WINDOWS
 
-                if spread_pct >= aggressive_spread and price_diff >= min_price_diff:
-                    candidates.append(window)
+        window_prices = prices.price[discharge_windows]
+        spread_pct = ((window_prices - cheap_avg) / cheap_avg) * 100
+        price_diff = window_prices - cheap_avg
 
-        return candidates
+        return discharge_windows[(spread_pct >= aggressive_spread) & (price_diff >= min_price_diff)]
 
     def _determine_current_state(
         self,
-        prices: List[Dict[str, Any]],
-        charge_windows: List[Dict[str, Any]],
-        discharge_windows: List[Dict[str, Any]],
-        aggressive_windows: List[Dict[str, Any]],
+        prices: PriceSeries,
+        scheduled_states: np.ndarray,
         config: Dict[str, Any]
     ) -> str:
         """Determine current state based on time and configuration."""
@@ -530,73 +794,64 @@ class WindowCalculationEngine:
             if self._is_in_time_range(current_time, start_str, end_str):
                 return self._mode_to_state(mode)
 
+        slot = self._current_slot(prices, current_time)
+
         # Check price override
         if config.get("price_override_enabled", False):
             threshold = config.get("price_override_threshold", 0.15)
-            current_price = self._get_current_price(prices, current_time)
+            current_price = None if slot is None else float(prices.price[slot])
             if current_price and current_price <= threshold:
                 return STATE_CHARGE
 
         # Check scheduled windows
-        for window in aggressive_windows:
-            if self._is_window_active(window, current_time):
-                return STATE_DISCHARGE_AGGRESSIVE
+        if slot is None:
+            return STATE_IDLE
+        return _SLOT_STATES[scheduled_states[slot]]
 
-        for window in discharge_windows:
-            if self._is_window_active(window, current_time):
-                return STATE_DISCHARGE
-
-        for window in charge_windows:
-            if self._is_window_active(window, current_time):
-                return STATE_CHARGE
-
-        return STATE_IDLE
-
-    def _is_window_active(self, window: Dict[str, Any], current_time: datetime) -> bool:
-        """Check if a window is currently active."""
-        window_time = window["timestamp"]
-        window_duration = window["duration"]
+    def _is_in_time_range(self, current_time: datetime, start_str: str, end_str: str) -> bool:
+        """Check if current time is within a time range."""
+        time_range = _parse_time_range(start_str, end_str)
+        if time_range is None:
+            return False
 
-        # Check if current time falls within the window
-        window_start = window_time
-        window_end = window_time + timedelta(minutes=window_duration)
+        start_time, end_time = time_range
+        current_minute = current_time.hour * 60 + current_time.minute
 
-        return window_start <= current_time < window_end
+        # Handle overnight periods
+        if end_time < start_time:
+            return current_minute >= start_time or current_minute < end_time
+        return start_time <= current_minute < end_time
 
-    def _is_in_time_range(self, current_time: datetime, start_str: str, end_str: str) -> bool:
-        """Check if current time is within a time range."""
-        try:
-            # Parse time strings (HH:MM:SS format)
-            start_parts = start_str.split(":")
-            end_parts = end_str.split(":")
-
-            start_time = current_time.replace(
-                hour=int(start_parts[0]),
-                minute=int(start_parts[1]),
-                second=0
-            )
-            end_time = current_time.replace(
-                hour=int(end_parts[0]),
-                minute=int(end_parts[1]),
-                second=0
-            )
+    def _time_range_mask(
+        self, minute_of_day: np.ndarray, start_str: str, end_str: str
+    ) -> np.ndarray:
+        """Return which slot start times are within a time range."""
+        time_range = _parse_time_range(start_str, end_str)
+        if time_range is None:
+            return np.zeros(minute_of_day.shape, dtype=bool)
 
-            # Handle overnight periods
-            if end_time < start_time:
-                return current_time >= start_time or current_time < end_time
-            else:
-                return start_time <= current_time < end_time
+        start_time, end_time = time_range
 
-        except (ValueError, IndexError, AttributeError):
-            return False
+        # Handle overnight periods
+        if end_time < start_time:
+            return (minute_of_day >= start_time) | (minute_of_day < end_time)
+        return (minute_of_day >= start_time) & (minute_of_day < end_time)
 
     def _get_current_price(
-        self, prices: List[Dict[str, Any]], current_time: datetime
+        self, prices: PriceSeries, current_time: datetime
     ) -> Optional[float]:
         """Get the current price."""
-        for price_data in prices:
-            if self._is_window_active(price_data, current_time):
-                return price_data["price"]
+        slot = self._current_slot(prices, current_time)
+        return None if slot is None else float(prices.price[slot])
+
+    def _current_slot(self, prices: PriceSeries, current_time: datetime) -> Optional[int]:
+        """Return the index of the earliest slot active at current_time, if any."""
+        now = current_time.timestamp()
+        # Slots are sorted by start, so the first one ending after now is the
+        # only candidate; it is active if it has already started
+        slot = int(np.searchsorted(prices.epoch, now - prices.duration * 60, side="right"))
+        if slot < len(prices) and prices.epoch[slot] <= now:
+            return slot
         return None
 
     def _mode_to_state(self, mode: str) -> str:
@@ -612,13 +867,13 @@ class WindowCalculationEngine:
 
     def _calculate_actual_windows(
         self,
-        prices: List[Dict[str, Any]],
-        charge_windows: List[Dict[str, Any]],
-        discharge_windows: List[Dict[str, Any]],
-        aggressive_windows: List[Dict[str, Any]],
+        prices: PriceSeries,
+        charge_windows: np.ndarray,
+        discharge_windows: np.ndarray,
+        scheduled_states: np.ndarray,
         config: Dict[str, Any],
         is_tomorrow: bool = False
-    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Calculate actual charge/discharge windows considering time and price overrides.
 
         This shows what the battery will ACTUALLY do when overrides are applied.
@@ -629,15 +884,15 @@ class WindowCalculationEngine:
           even if not in calculated windows.
 
         Args:
-            prices: List of processed price data
+            prices: Processed price series
             charge_windows: Calculated charge windows
             discharge_windows: Calculated discharge windows
-            aggressive_windows: Calculated aggressive discharge windows
+            scheduled_states: Slot state codes of the calculated windows
             config: Configuration dictionary
             is_tomorrow: Whether calculating for tomorrow (affects config key suffix)
 
         Returns:
-            Tuple of (actual_charge_windows, actual_discharge_windows)
+            Tuple of (actual_charge_windows, actual_discharge_windows) as slot indices
         """
         # Use tomorrow's config if applicable
         suffix = "_tomorrow" if is_tomorrow and config.get("tomorrow_settings_enabled", False) else ""
@@ -648,7 +903,7 @@ class WindowCalculationEngine:
 
         if not time_override_enabled and not price_override_enabled:
             # No overrides, return calculated windows as-is (don't combine normal + aggressive)
-            return list(charge_windows), list(discharge_windows)
+            return charge_windows, discharge_windows
 
         # Get override configuration (using suffix for tomorrow settings)
         override_start_str = config.get(f"time_override_start{suffix}", "")
@@ -661,62 +916,38 @@ class WindowCalculationEngine:
             # Invalid time override config, disable it
             time_override_enabled = False
 
-        # Build a complete timeline of all price windows with their states
-        # considering calculated windows, time overrides, and price overrides
-        timeline = []
-
-        for price_data in prices:
-            timestamp = price_data["timestamp"]
-            duration = price_data["duration"]
-            price = price_data["price"]
-
-            # Determine state for this time period (priority order: time override > price override > calculated)
-            state = STATE_IDLE  # Default
-
-            # Check time override first (highest priority)
-            if time_override_enabled and self._is_in_time_range(timestamp, override_start_str, override_end_str):
-                state = self._mode_to_state(override_mode)
-            # Check price override
-            elif price_override_enabled and price <= price_override_threshold:
-                state = STATE_CHARGE
-            else:
-                # Check calculated windows
-                for window in aggressive_windows:
-                    if self._is_window_active(window, timestamp):
-                        state = STATE_DISCHARGE_AGGRESSIVE
-                        break
-
-                if state == STATE_IDLE:
-                    for window in discharge_windows:
-                        if self._is_window_active(window, timestamp):
-                            state = STATE_DISCHARGE
-                            break
-
-                if state == STATE_IDLE:
-                    for window in charge_windows:
-                        if self._is_window_active(window, timestamp):
-                            state = STATE_CHARGE
-                            break
-
-            timeline.append({
-                "timestamp": timestamp,
-                "price": price_data["price"],
-                "duration": duration,
-                "state": state
-            })
-
-        # Extract actual charge and discharge windows from timeline
-        new_actual_charge = [w for w in timeline if w["state"] == STATE_CHARGE]
-        new_actual_discharge = [w for w in timeline if w["state"] in [STATE_DISCHARGE, STATE_DISCHARGE_AGGRESSIVE]]
+        # Determine the state of every price slot, considering calculated
+        # windows, time overrides, and price overrides. Later assignments
+        # win, so apply them in increasing priority: calculated windows <
+        # price override < time override.
+        n = len(scheduled_states)
+        if self._state_buf.size < n:
+            self._state_buf = np.empty(n, dtype=np.int8)
+        states = self._state_buf[:n]
+        np.copyto(states, scheduled_states)
+
+        if price_override_enabled:
+            states[prices.price <= price_override_threshold] = _SLOT_CHARGE
+
+        if time_override_enabled:
+            in_override = self._time_range_mask(
+                prices.minute_of_day, override_start_str, override_end_str
+            )
+            states[in_override] = _MODE_TO_SLOT.get(override_mode, _SLOT_IDLE)
+
+        # Extract actual charge and discharge windows from the slot states
+        new_actual_charge = np.flatnonzero(states == _SLOT_CHARGE)
+        new_actual_discharge = np.flatnonzero(states >= _SLOT_DISCHARGE)
 
         return new_actual_charge, new_actual_discharge
 
     def _build_result(
         self,
-        prices: List[Dict[str, Any]],
-        charge_windows: List[Dict[str, Any]],
-        discharge_windows: List[Dict[str, Any]],
-        aggressive_windows: List[Dict[str, Any]],
+        prices: PriceSeries,
+        charge_windows: np.ndarray,
+        discharge_windows: np.ndarray,
+        aggressive_windows: np.ndarray,
+        scheduled_states: np.ndarray,
         current_state: str,
         config: Dict[str, Any],
         is_tomorrow: bool
@@ -727,11 +958,8 @@ class WindowCalculationEngine:
         current_price = self._get_current_price(prices, current_time)
 
         # Calculate averages
-        cheap_prices = [w["price"] for w in charge_windows]
-        expensive_prices = [w["price"] for w in discharge_windows]
-
-        avg_cheap = float(np.mean(cheap_prices)) if cheap_prices else 0.0
-        avg_expensive = float(np.mean(expensive_prices)) if expensive_prices else 0.0
+        avg_cheap = float(np.mean(prices.price[charge_windows])) if charge_windows.size else 0.0
+        avg_expensive = float(np.mean(prices.price[discharge_windows])) if discharge_windows.size else 0.0
 
         # Calculate spreads
         spread_pct = 0.0
@@ -743,68 +971,96 @@ class WindowCalculationEngine:
             prices,
             charge_windows,
             discharge_windows,
-            aggressive_windows,
+            scheduled_states,
             config,
             is_tomorrow
         )
 
-        # Count completed windows (use actual windows to include price/time overrides)
-        completed_charge = sum(
-            1 for w in actual_charge
-            if w["timestamp"] + timedelta(minutes=w["duration"]) <= current_time
-        )
-        completed_discharge = sum(
-            1 for w in actual_discharge
-            if w["timestamp"] + timedelta(minutes=w["duration"]) <= current_time
-        )
+        window_hours = prices.duration / 60
+
+        # Completed windows (use actual windows to include price/time overrides)
+        current_ts = current_time.timestamp()
+        slot_seconds = prices.duration * 60
+        completed_charge_windows = actual_charge[
+            prices.epoch[actual_charge] + slot_seconds <= current_ts
+        ]
+        completed_discharge_windows = actual_discharge[
+            prices.epoch[actual_discharge] + slot_seconds <= current_ts
+        ]
+        completed_charge = int(completed_charge_windows.size)
+        completed_discharge = int(completed_discharge_windows.size)
 
         # Calculate costs (use actual windows to include price/time overrides)
-        charge_power = config.get("charge_power", 2400) / 1000  # Convert to kW
-        discharge_power = config.get("discharge_power", 2400) / 1000
+        # Powers arrive in kW from the coordinator; fall back to converting W
+        charge_power = config.get("charge_power_kw")
+        if charge_power is None:
+            charge_power = config.get("charge_power", 2400) / 1000
+        discharge_power = config.get("discharge_power_kw")
+        if discharge_power is None:
+            discharge_power = config.get("discharge_power", 2400) / 1000
 
         completed_charge_cost = sum(
-            w["price"] * (w["duration"] / 60) * charge_power
-            for w in actual_charge
-            if w["timestamp"] + timedelta(minutes=w["duration"]) <= current_time
+            (prices.price[completed_charge_windows] * window_hours * charge_power).tolist()
         )
 
         completed_discharge_revenue = sum(
-            w["price"] * (w["duration"] / 60) * discharge_power
-            for w in actual_discharge
-            if w["timestamp"] + timedelta(minutes=w["duration"]) <= current_time
+            (prices.price[completed_discharge_windows] * window_hours * discharge_power).tolist()
         )
 
+        # Thresholds reported alongside the spread
+        min_spread = config.get("min_spread", 10)
+        min_spread_discharge = config.get("min_spread_discharge", 20)
+        aggressive_spread = config.get("aggressive_discharge_spread", 40)
+        spread_rounded = round(spread_pct, 1)
+        spread_met = spread_pct >= min_spread
+        discharge_spread_met = spread_pct >= min_spread_discharge
+        aggressive_discharge_spread_met = spread_pct >= aggressive_spread
+
+        # A missing or zero current price is reported as 0 and never
+        # activates the override; the threshold only matters while enabled
+        price_override_active = False
+        if current_price:
+            current_price_rounded = round(current_price, 5)
+            if config.get("price_override_enabled", False):
+                price_override_active = current_price <= config.get("price_override_threshold", 0.15)
+        else:
+            current_price_rounded = 0
+
+        cheapest_times, cheapest_prices = prices.times_and_prices(charge_windows)
+        expensive_times, expensive_prices = prices.times_and_prices(discharge_windows)
+        aggressive_times, aggressive_prices = prices.times_and_prices(aggressive_windows)
+        actual_charge_times, actual_charge_prices = prices.times_and_prices(actual_charge)
+        actual_discharge_times, actual_discharge_prices = prices.times_and_prices(actual_discharge)
+
         # Build result
         result = {
             "state": current_state,
-            "cheapest_times": [w["timestamp"].isoformat() for w in charge_windows],
-            "cheapest_prices": [float(w["price"]) for w in charge_windows],
-            "expensive_times": [w["timestamp"].isoformat() for w in discharge_windows],
-            "expensive_prices": [float(w["price"]) for w in discharge_windows],
-            "expensive_times_aggressive": [w["timestamp"].isoformat() for w in aggressive_windows],
-            "expensive_prices_aggressive": [float(w["price"]) for w in aggressive_windows],
-            "actual_charge_times": [w["timestamp"].isoformat() for w in actual_charge],
-            "actual_charge_prices": [float(w["price"]) for w in actual_charge],
-            "actual_discharge_times": [w["timestamp"].isoformat() for w in actual_discharge],
-            "actual_discharge_prices": [float(w["price"]) for w in actual_discharge],
+            "cheapest_times": cheapest_times,
+            "cheapest_prices": cheapest_prices,
+            "expensive_times": expensive_times,
+            "expensive_prices": expensive_prices,
+            "expensive_times_aggressive": aggressive_times,
+            "expensive_prices_aggressive": aggressive_prices,
+            "actual_charge_times": actual_charge_times,
+            "actual_charge_prices": actual_charge_prices,
+            "actual_discharge_times": actual_discharge_times,
+            "actual_discharge_prices": actual_discharge_prices,
             "completed_charge_windows": completed_charge,
             "completed_discharge_windows": completed_discharge,
             "completed_charge_cost": round(completed_charge_cost, 3),
             "completed_discharge_revenue": round(completed_discharge_revenue, 3),
             "num_windows": len(charge_windows),
-            "min_spread_required": config.get("min_spread", 10),
-            "spread_percentage": round(spread_pct, 1),
-            "spread_met": bool(spread_pct >= config.get("min_spread", 10)),
-            "spread_avg": round(spread_pct, 1),
-            "actual_spread_avg": round(spread_pct, 1),
-            "discharge_spread_met": bool(spread_pct >= config.get("min_spread_discharge", 20)),
-            "aggressive_discharge_spread_met": bool(spread_pct >= config.get("aggressive_discharge_spread", 40)),
+            "min_spread_required": min_spread,
+            "spread_percentage": spread_rounded,
+            "spread_met": spread_met,
+            "spread_avg": spread_rounded,
+            "actual_spread_avg": spread_rounded,
+            "discharge_spread_met": discharge_spread_met,
+            "aggressive_discharge_spread_met": aggressive_discharge_spread_met,
             "avg_cheap_price": round(avg_cheap, 5),
             "avg_expensive_price": round(avg_expensive, 5),
-            "current_price": round(current_price, 5) if current_price else 0,
-            "price_override_active": config.get("price_override_enabled", False) and
-                                    current_price and
-                                    current_price <= config.get("price_override_threshold", 0.15),
+            "current_price": current_price_rounded,
+            "price_override_active": price_override_active,
             "time_override_active": config.get("time_override_enabled", False),
             "automation_enabled": config.get("automation_enabled", True),
             "calculation_window_enabled": config.get("calculation_window_enabled", False),
@@ -812,37 +1068,6 @@ class WindowCalculationEngine:
 
         return result
 
-    def _empty_result(self, is_tomorrow: bool) -> Dict[str, Any]:
-        """Return an empty result structure."""
-        return {
-            "state": STATE_OFF,
-            "cheapest_times": [],
-            "cheapest_prices": [],
-            "expensive_times": [],
-            "expensive_prices": [],
-            "expensive_times_aggressive": [],
-            "expensive_prices_aggressive": [],
-            "actual_charge_times": [],
-            "actual_charge_prices": [],
-            "actual_discharge_times": [],
-            "actual_discharge_prices": [],
-            "completed_charge_windows": 0,
-            "completed_discharge_windows": 0,
-            "completed_charge_cost": 0,
-            "completed_discharge_revenue": 0,
-            "num_windows": 0,
-            "min_spread_required": 0,
-            "spread_percentage": 0,
-            "spread_met": False,
-            "spread_avg": 0,
-            "actual_spread_avg": 0,
-            "discharge_spread_met": False,
-            "aggressive_discharge_spread_met": False,
-            "avg_cheap_price": 0,
-            "avg_expensive_price": 0,
-            "current_price": 0,
-            "price_override_active": False,
-            "time_override_active": False,
-            "automation_enabled": False,
-            "calculation_window_enabled": False,
-        }
\ No newline at end of file
+    def _empty_result(self) -> Mapping[str, Any]:
+        """Return the shared, read-only empty result structure."""
+        return _EMPTY_RESULT
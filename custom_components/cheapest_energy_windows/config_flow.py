@@ -1,15 +1,20 @@
 """Config flow for Cheapest Energy Windows integration."""
 from __future__ import annotations
 
+from functools import lru_cache
 import logging
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
+from homeassistant.helpers.event import (
+    async_track_state_added_domain,
+    async_track_state_removed_domain,
+)
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
@@ -45,9 +50,230 @@ from .const import (
     LOGGER_NAME,
     PREFIX,
 )
+from .services import async_create_notification_automation
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+# Pricing windows step description; only interpolates module defaults
+_PRICING_WINDOWS_INFO = f"Configure pricing window duration and optimization settings.\n\n📊 **Window Duration Selection:**\n• **15 Minutes**: For contracts with 15-minute pricing intervals\n• **1 Hour**: For contracts with hourly pricing intervals\n\n⚠️ **Note**: You must have a 15-minute interval price sensor even if selecting 1-hour windows. The system will automatically aggregate the 15-minute data into hourly windows.\n\nSpread settings control when to charge/discharge based on price differences.\n\nPrice Override: Always charge when price is below threshold, regardless of spread/windows.\n\nDefaults:\n- Charging Windows: {DEFAULT_CHARGING_WINDOWS}\n- Discharge Windows: {DEFAULT_EXPENSIVE_WINDOWS}\n- Percentiles: {DEFAULT_CHEAP_PERCENTILE}% cheap, {DEFAULT_EXPENSIVE_PERCENTILE}% expensive\n- Min Spreads: {DEFAULT_MIN_SPREAD}% charge, {DEFAULT_MIN_SPREAD_DISCHARGE}% discharge, {DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD}% aggressive\n- Price Override: Disabled, €{DEFAULT_PRICE_OVERRIDE_THRESHOLD}/kWh"
+
+# Number of detected price sensors listed in the price sensor step
+_MAX_LISTED_PRICE_SENSORS = 5
+
+# Battery step values that mean "not entered"
+_BATTERY_SENTINELS = frozenset({None, "", "not_configured"})
+
+# Schema for steps that only show information
+_EMPTY_SCHEMA = vol.Schema({})
+
+# Price sensor selection
+_PRICE_SENSOR_SCHEMA = vol.Schema({
+    vol.Required(CONF_PRICE_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+})
+
+# Cost parameters
+_COSTS_SCHEMA = vol.Schema({
+    vol.Required(CONF_VAT_RATE, default=DEFAULT_VAT_RATE): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=1)
+    ),
+    vol.Required(CONF_TAX, default=DEFAULT_TAX): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=1)
+    ),
+    vol.Required(CONF_ADDITIONAL_COST, default=DEFAULT_ADDITIONAL_COST): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=1)
+    ),
+})
+
+# Battery power parameters
+_POWER_SCHEMA = vol.Schema({
+    vol.Required("charge_power", default=DEFAULT_CHARGE_POWER): vol.All(
+        vol.Coerce(int), vol.Range(min=100, max=10000)
+    ),
+    vol.Required("discharge_power", default=DEFAULT_DISCHARGE_POWER): vol.All(
+        vol.Coerce(int), vol.Range(min=100, max=10000)
+    ),
+    vol.Required("battery_rte", default=DEFAULT_BATTERY_RTE): vol.All(
+        vol.Coerce(int), vol.Range(min=50, max=100)
+    ),
+})
+
+# Pricing window duration and spread settings
+_PRICING_WINDOWS_SCHEMA = vol.Schema({
+    vol.Required("pricing_window_duration", default=PRICING_1_HOUR): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"label": "15 Minutes (96 windows per day)", "value": PRICING_15_MINUTES},
+                {"label": "1 Hour (24 windows per day)", "value": PRICING_1_HOUR},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        )
+    ),
+    vol.Required("charging_windows", default=DEFAULT_CHARGING_WINDOWS): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=96,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("expensive_windows", default=DEFAULT_EXPENSIVE_WINDOWS): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=96,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("cheap_percentile", default=DEFAULT_CHEAP_PERCENTILE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=50,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("expensive_percentile", default=DEFAULT_EXPENSIVE_PERCENTILE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=50,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("min_spread", default=DEFAULT_MIN_SPREAD): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=200,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("min_spread_discharge", default=DEFAULT_MIN_SPREAD_DISCHARGE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=200,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("aggressive_discharge_spread", default=DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=300,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Optional("min_price_difference", default=DEFAULT_MIN_PRICE_DIFFERENCE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=0.5,
+            step=0.01,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+    vol.Required("price_override_enabled", default=False): selector.BooleanSelector(),
+    vol.Optional("price_override_threshold", default=DEFAULT_PRICE_OVERRIDE_THRESHOLD): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=0.5,
+            step=0.01,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    ),
+})
+
+# Optional battery system sensors
+_BATTERY_SCHEMA = vol.Schema({
+    vol.Optional(CONF_BATTERY_SYSTEM_NAME): cv.string,
+    vol.Optional(CONF_BATTERY_SOC_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+    vol.Optional(CONF_BATTERY_ENERGY_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+    vol.Optional(CONF_BATTERY_CHARGE_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+    vol.Optional(CONF_BATTERY_DISCHARGE_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+    vol.Optional(CONF_BATTERY_POWER_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            multiple=False,
+        )
+    ),
+})
+
+# Automations, scripts or scenes linked to battery modes
+_BATTERY_OPERATIONS_SCHEMA = vol.Schema({
+    vol.Optional("battery_idle_action"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["automation", "script", "scene"],
+            multiple=False,
+        )
+    ),
+    vol.Optional("battery_charge_action"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["automation", "script", "scene"],
+            multiple=False,
+        )
+    ),
+    vol.Optional("battery_discharge_action"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["automation", "script", "scene"],
+            multiple=False,
+        )
+    ),
+    vol.Optional("battery_aggressive_discharge_action"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["automation", "script", "scene"],
+            multiple=False,
+        )
+    ),
+    vol.Optional("battery_off_action"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["automation", "script", "scene"],
+            multiple=False,
+        )
+    ),
+})
+
+
+@lru_cache(maxsize=8)
+def _build_options_schema(
+    price_sensor: str, vat_rate: float, tax: float, additional_cost: float
+) -> vol.Schema:
+    """Build the options schema, reusing it while the defaults are unchanged."""
+    return vol.Schema({
+        vol.Optional(CONF_PRICE_SENSOR, default=price_sensor): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor",
+                multiple=False,
+            )
+        ),
+        vol.Optional(CONF_VAT_RATE, default=vat_rate): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(CONF_TAX, default=tax): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(CONF_ADDITIONAL_COST, default=additional_cost): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    })
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
@@ -59,10 +285,6 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         if not sensor_state:
             raise ValueError(f"Price sensor {price_sensor} not found")
 
-        # Check if it has the required attributes
-        if not hasattr(sensor_state, 'attributes'):
-            raise ValueError(f"Price sensor {price_sensor} has no attributes")
-
         attrs = sensor_state.attributes
 
         # Check for either Nord Pool or ENTSO-E format
@@ -88,6 +310,65 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self.data = {}
         self.options = {}
+        # Detected sensor count and listed sensors, kept until a sensor
+        # entity is added or removed
+        self._price_sensor_scan: tuple[int, list[str]] | None = None
+        self._scan_unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop tracking sensor entities when the flow is removed."""
+        for unsub in self._scan_unsubs:
+            unsub()
+        self._scan_unsubs = []
+
+    @callback
+    def _async_invalidate_scan(self, event: Event) -> None:
+        """Drop the detected sensors after a sensor entity is added or removed."""
+        self._price_sensor_scan = None
+
+    @callback
+    def _async_scan_price_sensors(self) -> tuple[int, list[str]]:
+        """Return the number of compatible price sensors and the first few as list lines.
+
+        Scans all sensors only when no cached result is available.
+        """
+        if self._price_sensor_scan is not None:
+            return self._price_sensor_scan
+
+        # Detect both Nord Pool and ENTSO-E formats; only the first few
+        # sensors are listed in the form
+        count = 0
+        sensor_list: list[str] = []
+
+        for state in self.hass.states.async_all("sensor"):
+            attrs = state.attributes
+
+            # Check for Nord Pool format, excluding sensors with price_in_cents
+            if attrs.get("raw_today") is not None:
+                if attrs.get("price_in_cents") is True:
+                    continue
+                sensor_format = "Nord Pool"
+
+            # Check for ENTSO-E format
+            elif attrs.get("prices_today") is not None:
+                sensor_format = "ENTSO-E"
+            else:
+                continue
+
+            count += 1
+            if len(sensor_list) < _MAX_LISTED_PRICE_SENSORS:
+                sensor_list.append(f"- {state.entity_id} ({sensor_format})")
+
+        self._price_sensor_scan = (count, sensor_list)
+
+        if not self._scan_unsubs:
+            self._scan_unsubs = [
+                async_track_state_added_domain(self.hass, "sensor", self._async_invalidate_scan),
+                async_track_state_removed_domain(self.hass, "sensor", self._async_invalidate_scan),
+            ]
+
+        return self._price_sensor_scan
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -120,64 +401,29 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.error(f"Price sensor validation failed: {e}")
 
         # Try to auto-detect price sensors (both Nord Pool and ENTSO-E formats)
-        price_sensors = []
-        entsoe_sensors = []
-        nordpool_sensors = []
-
-        for state in self.hass.states.async_all("sensor"):
-            attrs = state.attributes
-
-            # Check for Nord Pool format
-            if attrs.get("raw_today") is not None:
-                # Exclude sensors with price_in_cents
-                if attrs.get("price_in_cents") is True:
-                    continue
-                nordpool_sensors.append(state.entity_id)
-                price_sensors.append(state.entity_id)
-
-            # Check for ENTSO-E format
-            elif attrs.get("prices_today") is not None:
-                entsoe_sensors.append(state.entity_id)
-                price_sensors.append(state.entity_id)
+        sensor_count, sensor_list = self._async_scan_price_sensors()
 
         # Show error if no sensors found
-        if not price_sensors:
+        if not sensor_count:
             return self.async_show_form(
                 step_id="price_sensor",
-                data_schema=vol.Schema({}),
+                data_schema=_EMPTY_SCHEMA,
                 errors={"base": "no_price_sensors"},
                 description_placeholders={
                     "info": "⚠️ No compatible price sensors found!\n\nPlease install the Nordpool integration from HACS first:\n1. Go to HACS → Integrations\n2. Search for 'Nordpool'\n3. Install and configure it\n4. Return here to continue setup\n\nThe sensor must have a 'raw_today' attribute with hourly or 15-minute price data."
                 },
             )
 
-        # Build sensor list with format indicators
-        sensor_list = []
-        for sensor in price_sensors[:5]:
-            if sensor in entsoe_sensors:
-                sensor_list.append(f"- {sensor} (ENTSO-E)")
-            else:
-                sensor_list.append(f"- {sensor} (Nord Pool)")
-
         # Add sensor format notes
-        sensor_note = ""
-        if nordpool_sensors or entsoe_sensors:
-            sensor_note = "\n\n📝 **Sensor Requirements:**\n• **15-minute interval sensor required** - The integration needs 15-minute price data for optimal window calculation\n• If you have hourly pricing contracts, the system will automatically aggregate 15-minute data into hourly windows\n• Both Nord Pool and ENTSO-E 15-minute sensors are supported"
+        sensor_note = "\n\n📝 **Sensor Requirements:**\n• **15-minute interval sensor required** - The integration needs 15-minute price data for optimal window calculation\n• If you have hourly pricing contracts, the system will automatically aggregate 15-minute data into hourly windows\n• Both Nord Pool and ENTSO-E 15-minute sensors are supported"
 
         # Show available sensors for selection (no default)
         return self.async_show_form(
             step_id="price_sensor",
-            data_schema=vol.Schema({
-                vol.Required(CONF_PRICE_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-            }),
+            data_schema=_PRICE_SENSOR_SCHEMA,
             errors=errors,
             description_placeholders={
-                "info": f"✅ Detected {len(price_sensors)} compatible price sensor(s)\n\n⚠️ **IMPORTANT - Price Unit Requirement:**\nYour price sensor MUST use EUR/kWh (e.g., 0.25), NOT cents (e.g., 25).\nSensors configured for cents/kWh are currently not supported and will cause incorrect calculations.\n\nPlease select your price sensor:\n{chr(10).join(sensor_list)}\n\nSupported sensor formats:\n• Nord Pool: 'raw_today'/'raw_tomorrow' attributes\n• ENTSO-E: 'prices_today'/'prices_tomorrow' attributes{sensor_note}"
+                "info": f"✅ Detected {sensor_count} compatible price sensor(s)\n\n⚠️ **IMPORTANT - Price Unit Requirement:**\nYour price sensor MUST use EUR/kWh (e.g., 0.25), NOT cents (e.g., 25).\nSensors configured for cents/kWh are currently not supported and will cause incorrect calculations.\n\nPlease select your price sensor:\n{chr(10).join(sensor_list)}\n\nSupported sensor formats:\n• Nord Pool: 'raw_today'/'raw_tomorrow' attributes\n• ENTSO-E: 'prices_today'/'prices_tomorrow' attributes{sensor_note}"
             },
         )
 
@@ -191,17 +437,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="costs",
-            data_schema=vol.Schema({
-                vol.Required(CONF_VAT_RATE, default=DEFAULT_VAT_RATE): vol.All(
-                    vol.Coerce(float), vol.Range(min=0, max=1)
-                ),
-                vol.Required(CONF_TAX, default=DEFAULT_TAX): vol.All(
-                    vol.Coerce(float), vol.Range(min=0, max=1)
-                ),
-                vol.Required(CONF_ADDITIONAL_COST, default=DEFAULT_ADDITIONAL_COST): vol.All(
-                    vol.Coerce(float), vol.Range(min=0, max=1)
-                ),
-            }),
+            data_schema=_COSTS_SCHEMA,
             description_placeholders={
                 "vat_help": "VAT rate as decimal (e.g., 0.21 for 21%)",
                 "tax_help": "Tax per kWh in EUR",
@@ -222,17 +458,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="power",
-            data_schema=vol.Schema({
-                vol.Required("charge_power", default=DEFAULT_CHARGE_POWER): vol.All(
-                    vol.Coerce(int), vol.Range(min=100, max=10000)
-                ),
-                vol.Required("discharge_power", default=DEFAULT_DISCHARGE_POWER): vol.All(
-                    vol.Coerce(int), vol.Range(min=100, max=10000)
-                ),
-                vol.Required("battery_rte", default=DEFAULT_BATTERY_RTE): vol.All(
-                    vol.Coerce(int), vol.Range(min=50, max=100)
-                ),
-            }),
+            data_schema=_POWER_SCHEMA,
             description_placeholders={
                 "charge_help": "Battery charging power in Watts (800W is typical for single battery)",
                 "discharge_help": "Battery discharging power in Watts",
@@ -252,85 +478,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="pricing_windows",
-            data_schema=vol.Schema({
-                vol.Required("pricing_window_duration", default=PRICING_1_HOUR): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"label": "15 Minutes (96 windows per day)", "value": PRICING_15_MINUTES},
-                            {"label": "1 Hour (24 windows per day)", "value": PRICING_1_HOUR},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Required("charging_windows", default=DEFAULT_CHARGING_WINDOWS): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=96,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("expensive_windows", default=DEFAULT_EXPENSIVE_WINDOWS): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=96,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("cheap_percentile", default=DEFAULT_CHEAP_PERCENTILE): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=1,
-                        max=50,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("expensive_percentile", default=DEFAULT_EXPENSIVE_PERCENTILE): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=1,
-                        max=50,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("min_spread", default=DEFAULT_MIN_SPREAD): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=200,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("min_spread_discharge", default=DEFAULT_MIN_SPREAD_DISCHARGE): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=200,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("aggressive_discharge_spread", default=DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=300,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Optional("min_price_difference", default=DEFAULT_MIN_PRICE_DIFFERENCE): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=0.5,
-                        step=0.01,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Required("price_override_enabled", default=False): selector.BooleanSelector(),
-                vol.Optional("price_override_threshold", default=DEFAULT_PRICE_OVERRIDE_THRESHOLD): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=0.5,
-                        step=0.01,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-            }),
+            data_schema=_PRICING_WINDOWS_SCHEMA,
             description_placeholders={
-                "info": f"Configure pricing window duration and optimization settings.\n\n📊 **Window Duration Selection:**\n• **15 Minutes**: For contracts with 15-minute pricing intervals\n• **1 Hour**: For contracts with hourly pricing intervals\n\n⚠️ **Note**: You must have a 15-minute interval price sensor even if selecting 1-hour windows. The system will automatically aggregate the 15-minute data into hourly windows.\n\nSpread settings control when to charge/discharge based on price differences.\n\nPrice Override: Always charge when price is below threshold, regardless of spread/windows.\n\nDefaults:\n- Charging Windows: {DEFAULT_CHARGING_WINDOWS}\n- Discharge Windows: {DEFAULT_EXPENSIVE_WINDOWS}\n- Percentiles: {DEFAULT_CHEAP_PERCENTILE}% cheap, {DEFAULT_EXPENSIVE_PERCENTILE}% expensive\n- Min Spreads: {DEFAULT_MIN_SPREAD}% charge, {DEFAULT_MIN_SPREAD_DISCHARGE}% discharge, {DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD}% aggressive\n- Price Override: Disabled, €{DEFAULT_PRICE_OVERRIDE_THRESHOLD}/kWh"
+                "info": _PRICING_WINDOWS_INFO
             },
         )
 
@@ -339,54 +489,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Configure battery system (optional)."""
         if user_input is not None:
-            # Check if user actually entered any battery data
-            battery_data = {
-                k: v for k, v in user_input.items()
-                if v is not None and v != "" and v != "not_configured"
-            }
-
-            # Save to both data and options so entities can access it
-            if battery_data:
-                self.data.update(battery_data)
-                self.options.update(battery_data)
+            # Save entered battery data to both data and options so entities
+            # can access it
+            for key, value in user_input.items():
+                if value in _BATTERY_SENTINELS:
+                    continue
+                self.data[key] = value
+                self.options[key] = value
 
             return await self.async_step_battery_operations()
 
         return self.async_show_form(
             step_id="battery",
-            data_schema=vol.Schema({
-                vol.Optional(CONF_BATTERY_SYSTEM_NAME): cv.string,
-                vol.Optional(CONF_BATTERY_SOC_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_BATTERY_ENERGY_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_BATTERY_CHARGE_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_BATTERY_DISCHARGE_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_BATTERY_POWER_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-            }),
+            data_schema=_BATTERY_SCHEMA,
             description_placeholders={
                 "info": "Optional: Configure battery system sensors for monitoring and automation.\n\nLeave fields empty to skip battery configuration.\n\nYou can configure these later through the integration settings."
             },
@@ -410,38 +525,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="battery_operations",
-            data_schema=vol.Schema({
-                vol.Optional("battery_idle_action"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["automation", "script", "scene"],
-                        multiple=False,
-                    )
-                ),
-                vol.Optional("battery_charge_action"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["automation", "script", "scene"],
-                        multiple=False,
-                    )
-                ),
-                vol.Optional("battery_discharge_action"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["automation", "script", "scene"],
-                        multiple=False,
-                    )
-                ),
-                vol.Optional("battery_aggressive_discharge_action"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["automation", "script", "scene"],
-                        multiple=False,
-                    )
-                ),
-                vol.Optional("battery_off_action"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["automation", "script", "scene"],
-                        multiple=False,
-                    )
-                ),
-            }),
+            data_schema=_BATTERY_OPERATIONS_SCHEMA,
             description_placeholders={
                 "info": "⚙️ **Battery Operations (Optional)**\n\nLink existing automations, scripts, or scenes to battery modes. They'll be triggered automatically when modes change.\n\n**How it works:**\n- Create your battery control automations/scripts first\n- Select them from the dropdowns below\n- CEW will automatically trigger them when entering each mode\n\nLeave blank to configure later in Settings → Battery Operations."
             },
@@ -454,9 +538,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            # Import the function here to avoid circular imports
-            from .services import async_create_notification_automation
-
             # Create the automation
             success, message = await async_create_notification_automation(self.hass)
 
@@ -474,7 +555,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="automation",
-            data_schema=vol.Schema({}),
+            data_schema=_EMPTY_SCHEMA,
             errors=errors,
             description_placeholders={
                 "info": "🤖 **Create Battery Control Automation**\n\n"
@@ -553,7 +634,7 @@ Total: 71 entities
 
         return self.async_show_form(
             step_id="confirm",
-            data_schema=vol.Schema({}),
+            data_schema=_EMPTY_SCHEMA,
             description_placeholders={
                 "summary": summary,
             },
@@ -569,7 +650,7 @@ Total: 71 entities
 
         return self.async_show_form(
             step_id="dashboard",
-            data_schema=vol.Schema({}),
+            data_schema=_EMPTY_SCHEMA,
             description_placeholders={
                 "info": "📊 **Dashboard Available via HACS**\n\n"
                        "A beautiful, pre-configured dashboard is available as a separate HACS plugin.\n\n"
@@ -618,42 +699,14 @@ class CEWOptionsFlow(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         options = self.config_entry.options
+        data = self.config_entry.data
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Optional(
-                    CONF_PRICE_SENSOR,
-                    default=options.get(
-                        CONF_PRICE_SENSOR,
-                        self.config_entry.data.get(CONF_PRICE_SENSOR, DEFAULT_PRICE_SENSOR)
-                    ),
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(
-                    CONF_VAT_RATE,
-                    default=options.get(
-                        CONF_VAT_RATE,
-                        self.config_entry.data.get(CONF_VAT_RATE, DEFAULT_VAT_RATE)
-                    ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
-                vol.Optional(
-                    CONF_TAX,
-                    default=options.get(
-                        CONF_TAX,
-                        self.config_entry.data.get(CONF_TAX, DEFAULT_TAX)
-                    ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
-                vol.Optional(
-                    CONF_ADDITIONAL_COST,
-                    default=options.get(
-                        CONF_ADDITIONAL_COST,
-                        self.config_entry.data.get(CONF_ADDITIONAL_COST, DEFAULT_ADDITIONAL_COST)
-                    ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
-            }),
-        )
\ No newline at end of file
+            data_schema=_build_options_schema(
+                options.get(CONF_PRICE_SENSOR, data.get(CONF_PRICE_SENSOR, DEFAULT_PRICE_SENSOR)),
+                options.get(CONF_VAT_RATE, data.get(CONF_VAT_RATE, DEFAULT_VAT_RATE)),
+                options.get(CONF_TAX, data.get(CONF_TAX, DEFAULT_TAX)),
+                options.get(CONF_ADDITIONAL_COST, data.get(CONF_ADDITIONAL_COST, DEFAULT_ADDITIONAL_COST)),
+            ),
+        )
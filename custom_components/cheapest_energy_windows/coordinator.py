@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
@@ -18,10 +20,132 @@ from .const import (
     CONF_PRICE_SENSOR,
     DEFAULT_PRICE_SENSOR,
     PREFIX,
+    DEFAULT_CHARGING_WINDOWS,
+    DEFAULT_EXPENSIVE_WINDOWS,
+    DEFAULT_CHEAP_PERCENTILE,
+    DEFAULT_EXPENSIVE_PERCENTILE,
+    DEFAULT_MIN_SPREAD,
+    DEFAULT_MIN_SPREAD_DISCHARGE,
+    DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD,
+    DEFAULT_MIN_PRICE_DIFFERENCE,
+    DEFAULT_ADDITIONAL_COST,
+    DEFAULT_TAX,
+    DEFAULT_VAT_RATE,
+    DEFAULT_BATTERY_RTE,
+    DEFAULT_CHARGE_POWER,
+    DEFAULT_DISCHARGE_POWER,
+    DEFAULT_PRICE_OVERRIDE_THRESHOLD,
+    DEFAULT_QUIET_START,
+    DEFAULT_QUIET_END,
+    DEFAULT_TIME_OVERRIDE_START,
+    DEFAULT_TIME_OVERRIDE_END,
+    DEFAULT_CALCULATION_WINDOW_START,
+    DEFAULT_CALCULATION_WINDOW_END,
+    DEFAULT_BATTERY_MIN_SOC_DISCHARGE,
+    DEFAULT_BATTERY_MIN_SOC_AGGRESSIVE_DISCHARGE,
 )
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+# Configuration fields built from the entry options, as (key, default);
+# values are coerced per table and keep this order in the config dict
+_NUMBER_FIELDS: Tuple[Tuple[str, float], ...] = (
+    ("charging_windows", DEFAULT_CHARGING_WINDOWS),
+    ("expensive_windows", DEFAULT_EXPENSIVE_WINDOWS),
+    ("cheap_percentile", DEFAULT_CHEAP_PERCENTILE),
+    ("expensive_percentile", DEFAULT_EXPENSIVE_PERCENTILE),
+    ("min_spread", DEFAULT_MIN_SPREAD),
+    ("min_spread_discharge", DEFAULT_MIN_SPREAD_DISCHARGE),
+    ("aggressive_discharge_spread", DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD),
+    ("min_price_difference", DEFAULT_MIN_PRICE_DIFFERENCE),
+    ("additional_cost", DEFAULT_ADDITIONAL_COST),
+    ("tax", DEFAULT_TAX),
+    ("vat", DEFAULT_VAT_RATE),
+    ("battery_rte", DEFAULT_BATTERY_RTE),
+    ("charge_power", DEFAULT_CHARGE_POWER),
+    ("discharge_power", DEFAULT_DISCHARGE_POWER),
+    ("price_override_threshold", DEFAULT_PRICE_OVERRIDE_THRESHOLD),
+    ("battery_min_soc_discharge", DEFAULT_BATTERY_MIN_SOC_DISCHARGE),
+    ("battery_min_soc_aggressive_discharge", DEFAULT_BATTERY_MIN_SOC_AGGRESSIVE_DISCHARGE),
+    ("charging_windows_tomorrow", DEFAULT_CHARGING_WINDOWS),
+    ("expensive_windows_tomorrow", DEFAULT_EXPENSIVE_WINDOWS),
+    ("cheap_percentile_tomorrow", DEFAULT_CHEAP_PERCENTILE),
+    ("expensive_percentile_tomorrow", DEFAULT_EXPENSIVE_PERCENTILE),
+    ("min_spread_tomorrow", DEFAULT_MIN_SPREAD),
+    ("min_spread_discharge_tomorrow", DEFAULT_MIN_SPREAD_DISCHARGE),
+    ("aggressive_discharge_spread_tomorrow", DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD),
+    ("min_price_difference_tomorrow", DEFAULT_MIN_PRICE_DIFFERENCE),
+    ("price_override_threshold_tomorrow", DEFAULT_PRICE_OVERRIDE_THRESHOLD),
+)
+
+_BOOL_FIELDS: Tuple[Tuple[str, bool], ...] = (
+    ("automation_enabled", True),
+    ("tomorrow_settings_enabled", False),
+    ("midnight_rotation_notifications", False),
+    ("notifications_enabled", True),
+    ("quiet_hours_enabled", False),
+    ("price_override_enabled", False),
+    ("price_override_enabled_tomorrow", False),
+    ("time_override_enabled", False),
+    ("time_override_enabled_tomorrow", False),
+    ("calculation_window_enabled", False),
+    ("calculation_window_enabled_tomorrow", False),
+    ("notify_automation_disabled", False),
+    ("notify_charging", True),
+    ("notify_discharge", True),
+    ("notify_discharge_aggressive", True),
+    ("notify_idle", False),
+)
+
+# Select and time values are used as stored
+_RAW_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("pricing_window_duration", "15_minutes"),
+    ("time_override_mode", "charge"),
+    ("time_override_mode_tomorrow", "charge"),
+    ("time_override_start", DEFAULT_TIME_OVERRIDE_START),
+    ("time_override_end", DEFAULT_TIME_OVERRIDE_END),
+    ("time_override_start_tomorrow", DEFAULT_TIME_OVERRIDE_START),
+    ("time_override_end_tomorrow", DEFAULT_TIME_OVERRIDE_END),
+    ("calculation_window_start", DEFAULT_CALCULATION_WINDOW_START),
+    ("calculation_window_end", DEFAULT_CALCULATION_WINDOW_END),
+    ("calculation_window_start_tomorrow", DEFAULT_CALCULATION_WINDOW_START),
+    ("calculation_window_end_tomorrow", DEFAULT_CALCULATION_WINDOW_END),
+    ("quiet_hours_start", DEFAULT_QUIET_START),
+    ("quiet_hours_end", DEFAULT_QUIET_END),
+)
+
+_BANNER = "=" * 60
+
+# Seconds to coalesce refresh requests after an immediate refresh
+REQUEST_REFRESH_COOLDOWN = 3.0
+
+# Seconds to gather setting changes before requesting a refresh
+SETTINGS_CHANGE_COOLDOWN = 0.5
+
+
+def _price_data_hash(data: Optional[list]) -> str:
+    """Create a simple fingerprint of price data for comparison.
+
+    Uses the length, the first start and the first and last values; the
+    start tells apart days whose boundary prices happen to match.
+    """
+    if not data:
+        return ""
+    try:
+        first = data[0]
+        return f"{len(data)}_{first['value']}_{first['start']}_{data[-1]['value']}"
+    except (IndexError, KeyError, TypeError):
+        return str(len(data))
+
+
+def _config_hash(cfg: Dict[str, Any]) -> str:
+    """Create a compact fingerprint of the config for comparison.
+
+    The config is always built with the same keys in the same order, so its
+    items are fingerprinted as they are, without sorting.
+    """
+    return hashlib.blake2b(repr(list(cfg.items())).encode(), digest_size=8).hexdigest()
+
 
 class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
     """Class to manage fetching Cheapest Energy Windows data."""
@@ -33,6 +157,14 @@ class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             _LOGGER,
             name=DOMAIN,
             update_interval=UPDATE_INTERVAL,
+            # The first request refreshes immediately; bursts of setting
+            # changes are then coalesced into one trailing refresh
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REQUEST_REFRESH_COOLDOWN,
+                immediate=True,
+            ),
         )
 
         self.config_entry = config_entry
@@ -43,64 +175,82 @@ class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         persistent_key = f"{DOMAIN}_{config_entry.entry_id}_price_state"
         if persistent_key not in hass.data:
             hass.data[persistent_key] = {
-                "previous_raw_today": None,
-                "previous_raw_tomorrow": None,
+                "previous_today_hash": None,
+                "previous_tomorrow_hash": None,
                 "last_price_update": None,
                 "last_config_update": None,
                 "previous_config_hash": None,
             }
         self._persistent_state = hass.data[persistent_key]
 
-        # Instance variables (for convenience, but backed by persistent storage)
-        self._previous_raw_today: Optional[list] = self._persistent_state["previous_raw_today"]
-        self._previous_raw_tomorrow: Optional[list] = self._persistent_state["previous_raw_tomorrow"]
-        self._last_price_update: Optional[datetime] = self._persistent_state["last_price_update"]
-        self._last_config_update: Optional[datetime] = self._persistent_state["last_config_update"]
-        self._previous_config_hash: Optional[str] = self._persistent_state["previous_config_hash"]
+        # Price sensor state, price lists and config object fingerprinted by
+        # the last update
+        self._last_price_state_updated: Optional[datetime] = None
+        self._previous_today_ref: Optional[list] = None
+        self._previous_tomorrow_ref: Optional[list] = None
+        self._hashed_config: Optional[Dict[str, Any]] = None
+
+        # Settings changes arriving together request a single refresh
+        self._settings_change_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=SETTINGS_CHANGE_COOLDOWN,
+            immediate=False,
+            function=self.async_request_refresh,
+        )
+
+        # Configuration built from the current options mapping; the config
+        # entry replaces its options object on every update
+        self._cached_options_ref: Optional[Any] = None
+        self._cached_config: Optional[Dict[str, Any]] = None
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from price sensor."""
-        _LOGGER.info("="*60)
-        _LOGGER.info("COORDINATOR UPDATE START")
-        _LOGGER.info("="*60)
+        _LOGGER.info("%s\nCOORDINATOR UPDATE START\n%s", _BANNER, _BANNER)
 
         try:
             # Always use the proxy sensor which normalizes different price sensor formats
             # The proxy sensor handles both Nord Pool and ENTSO-E formats
             price_sensor = "sensor.cew_price_sensor_proxy"
-            _LOGGER.info(f"Using proxy price sensor: {price_sensor}")
+            _LOGGER.info("Using proxy price sensor: %s", price_sensor)
 
             # Get the price sensor state
             price_state = self.hass.states.get(price_sensor)
-            _LOGGER.info(f"Price sensor state exists: {price_state is not None}")
+            _LOGGER.info("Price sensor state exists: %s", price_state is not None)
 
             if not price_state:
-                _LOGGER.warning(f"Price sensor {price_sensor} not found, returning empty data")
-                _LOGGER.info(f"Available sensors: {[e for e in self.hass.states.async_entity_ids() if 'nordpool' in e or 'price' in e]}")
+                _LOGGER.warning("Price sensor %s not found, returning empty data", price_sensor)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug(
+                        "Available sensors: %s",
+                        [e for e in self.hass.states.async_entity_ids("sensor") if 'nordpool' in e or 'price' in e],
+                    )
                 return await self._empty_data(f"Price sensor {price_sensor} not found")
 
-            _LOGGER.info(f"Price sensor state: {price_state.state}")
-            _LOGGER.info(f"Price sensor attributes keys: {list(price_state.attributes.keys())}")
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("Price sensor state: %s", price_state.state)
+                _LOGGER.info("Price sensor attributes keys: %s", list(price_state.attributes.keys()))
 
             # Extract price data
             raw_today = price_state.attributes.get("raw_today", [])
             raw_tomorrow = price_state.attributes.get("raw_tomorrow", [])
             tomorrow_valid = price_state.attributes.get("tomorrow_valid", False)
 
-            _LOGGER.info(f"Raw today count: {len(raw_today)}")
-            _LOGGER.info(f"Raw tomorrow count: {len(raw_tomorrow)}")
-            _LOGGER.info(f"Tomorrow valid: {tomorrow_valid}")
+            _LOGGER.info("Raw today count: %d", len(raw_today))
+            _LOGGER.info("Raw tomorrow count: %d", len(raw_tomorrow))
+            _LOGGER.info("Tomorrow valid: %s", tomorrow_valid)
 
             if not raw_today:
                 _LOGGER.warning("No price data available for today")
-                _LOGGER.info(f"raw_today value: {raw_today}")
+                _LOGGER.info("raw_today value: %s", raw_today)
                 return await self._empty_data("No price data available")
 
             # Get configuration from config entry options (Layer 1: no race conditions)
             config = await self._get_configuration()
-            _LOGGER.debug(f"Config keys loaded: {list(config.keys())}")
-            _LOGGER.debug(f"Automation enabled: {config.get('automation_enabled', 'NOT SET')}")
-            _LOGGER.debug(f"Charging windows: {config.get('charging_windows', 'NOT SET')}")
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Config keys loaded: %s", list(config.keys()))
+                _LOGGER.debug("Automation enabled: %s", config.get('automation_enabled', 'NOT SET'))
+                _LOGGER.debug("Charging windows: %s", config.get('charging_windows', 'NOT SET'))
 
             # Layer 2: Detect what changed
             now = dt_util.now()
@@ -110,67 +260,83 @@ class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             scheduled_update = False  # New: track scheduled updates where nothing changed
 
             # Check if price data changed
-            # Compare lengths and a hash of the data for more reliable comparison
-            def _price_data_hash(data):
-                """Create a simple hash of price data for comparison."""
-                if not data:
-                    return ""
-                # Create hash from length and first/last items
-                try:
-                    return f"{len(data)}_{data[0].get('value', 0)}_{data[-1].get('value', 0)}"
-                except (IndexError, AttributeError, TypeError):
-                    return str(len(data))
-
-            def _config_hash(cfg):
-                """Create a simple hash of config for comparison."""
-                # Convert config dict to a sorted tuple of items for consistent hashing
-                try:
-                    return str(hash(tuple(sorted((k, str(v)) for k, v in cfg.items()))))
-                except (TypeError, AttributeError):
-                    return str(cfg)
-
-            current_today_hash = _price_data_hash(raw_today)
-            current_tomorrow_hash = _price_data_hash(raw_tomorrow)
-            previous_today_hash = _price_data_hash(self._previous_raw_today)
-            previous_tomorrow_hash = _price_data_hash(self._previous_raw_tomorrow)
-
-            current_config_hash = _config_hash(config)
-            previous_config_hash = self._previous_config_hash
-
-            _LOGGER.debug(f"Today hash: {current_today_hash} vs {previous_today_hash}")
-            _LOGGER.debug(f"Tomorrow hash: {current_tomorrow_hash} vs {previous_tomorrow_hash}")
-            _LOGGER.debug(f"Config hash: {current_config_hash} vs {previous_config_hash}")
+            # Compare lengths and a fingerprint of the data
+            persistent_state = self._persistent_state
+            previous_today_hash = persistent_state["previous_today_hash"] or ""
+            previous_tomorrow_hash = persistent_state["previous_tomorrow_hash"] or ""
+            previous_config_hash = persistent_state["previous_config_hash"]
+
+            # An unchanged price sensor state or config object was already
+            # fingerprinted by the previous update
+            price_state_updated = price_state.last_updated
+            if price_state_updated == self._last_price_state_updated:
+                current_today_hash = previous_today_hash
+                current_tomorrow_hash = previous_tomorrow_hash
+            else:
+                # The same list objects still hold the same prices
+                if raw_today is self._previous_today_ref:
+                    current_today_hash = previous_today_hash
+                else:
+                    current_today_hash = _price_data_hash(raw_today)
+                if raw_tomorrow is self._previous_tomorrow_ref:
+                    current_tomorrow_hash = previous_tomorrow_hash
+                else:
+                    current_tomorrow_hash = _price_data_hash(raw_tomorrow)
+
+            if config is self._hashed_config:
+                current_config_hash = previous_config_hash
+            else:
+                current_config_hash = _config_hash(config)
+
+            _LOGGER.debug("Today hash: %s vs %s", current_today_hash, previous_today_hash)
+            _LOGGER.debug("Tomorrow hash: %s vs %s", current_tomorrow_hash, previous_tomorrow_hash)
+            _LOGGER.debug("Config hash: %s vs %s", current_config_hash, previous_config_hash)
 
             # Check if this is the first load (no previous data)
             if not previous_today_hash and not previous_tomorrow_hash:
                 # First load after restart/reload - treat as initialization, not a real update
                 is_first_load = True
                 config_changed = True  # Treat as config change to avoid state transitions
-                self._last_config_update = now
-                self._persistent_state["last_config_update"] = now
+                persistent_state["last_config_update"] = now
                 _LOGGER.info("FIRST LOAD - Initializing without triggering state changes")
             elif current_today_hash != previous_today_hash or current_tomorrow_hash != previous_tomorrow_hash:
                 price_data_changed = True
-                self._last_price_update = now
-                self._persistent_state["last_price_update"] = now
+                persistent_state["last_price_update"] = now
                 _LOGGER.info("PRICE DATA CHANGED - This is a real update")
             elif previous_config_hash and current_config_hash != previous_config_hash:
                 config_changed = True
-                self._last_config_update = now
-                self._persistent_state["last_config_update"] = now
+                persistent_state["last_config_update"] = now
                 _LOGGER.info("CONFIG CHANGED - User updated settings")
             else:
                 # Nothing changed - this is a scheduled update for time-based state changes
                 scheduled_update = True
                 _LOGGER.info("SCHEDULED UPDATE - No price or config changes")
 
-            # Store current price data and config hash for next comparison
-            self._previous_raw_today = raw_today.copy() if raw_today else []
-            self._previous_raw_tomorrow = raw_tomorrow.copy() if raw_tomorrow else []
-            self._previous_config_hash = current_config_hash
-            self._persistent_state["previous_raw_today"] = self._previous_raw_today
-            self._persistent_state["previous_raw_tomorrow"] = self._previous_raw_tomorrow
-            self._persistent_state["previous_config_hash"] = current_config_hash
+            # Store current price data and config hashes for next comparison
+            persistent_state["previous_today_hash"] = current_today_hash
+            persistent_state["previous_tomorrow_hash"] = current_tomorrow_hash
+            persistent_state["previous_config_hash"] = current_config_hash
+            self._last_price_state_updated = price_state_updated
+            self._previous_today_ref = raw_today
+            self._previous_tomorrow_ref = raw_tomorrow
+            self._hashed_config = config
+
+            # Scheduled updates keep the previous successful data and only
+            # refresh the per-tick fields; listeners are still notified so
+            # time-based states advance
+            data = self.data
+            if scheduled_update and data is not None and "scheduled_update" in data:
+                data["raw_today"] = raw_today
+                data["raw_tomorrow"] = raw_tomorrow
+                data["tomorrow_valid"] = tomorrow_valid
+                data["config"] = config
+                data["last_update"] = now
+                data["price_data_changed"] = False
+                data["config_changed"] = False
+                data["is_first_load"] = False
+                data["scheduled_update"] = True
+                _LOGGER.info("COORDINATOR UPDATE SUCCESS (scheduled)\n%s", _BANNER)
+                return data
 
             # Process the data with metadata
             data = {
@@ -185,20 +351,20 @@ class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
                 "config_changed": config_changed,
                 "is_first_load": is_first_load,
                 "scheduled_update": scheduled_update,
-                "last_price_update": self._last_price_update,
-                "last_config_update": self._last_config_update,
+                "last_price_update": persistent_state["last_price_update"],
+                "last_config_update": persistent_state["last_config_update"],
             }
 
-            _LOGGER.info(f"Data structure keys: {list(data.keys())}")
-            _LOGGER.info(f"Price data changed: {price_data_changed}")
-            _LOGGER.info(f"Config changed: {config_changed}")
-            _LOGGER.info("COORDINATOR UPDATE SUCCESS")
-            _LOGGER.info("="*60)
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("Data structure keys: %s", list(data.keys()))
+                _LOGGER.info("Price data changed: %s", price_data_changed)
+                _LOGGER.info("Config changed: %s", config_changed)
+                _LOGGER.info("COORDINATOR UPDATE SUCCESS\n%s", _BANNER)
             return data
 
         except Exception as e:
-            _LOGGER.error(f"COORDINATOR UPDATE FAILED: {e}", exc_info=True)
-            _LOGGER.info("="*60)
+            _LOGGER.error("COORDINATOR UPDATE FAILED: %s", e, exc_info=True)
+            _LOGGER.info(_BANNER)
             raise UpdateFailed(f"Error fetching data: {e}") from e
 
 
@@ -207,113 +373,40 @@ class CEWCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
 
         Reading from config_entry.options instead of entity states eliminates
         race conditions where entity states might be temporarily unavailable
-        during updates.
+        during updates. The result is reused until the options change, so
+        callers must not modify it.
         """
-        from .const import (
-            DEFAULT_CHARGING_WINDOWS,
-            DEFAULT_EXPENSIVE_WINDOWS,
-            DEFAULT_CHEAP_PERCENTILE,
-            DEFAULT_EXPENSIVE_PERCENTILE,
-            DEFAULT_MIN_SPREAD,
-            DEFAULT_MIN_SPREAD_DISCHARGE,
-            DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD,
-            DEFAULT_MIN_PRICE_DIFFERENCE,
-            DEFAULT_ADDITIONAL_COST,
-            DEFAULT_TAX,
-            DEFAULT_VAT_RATE,
-            DEFAULT_BATTERY_RTE,
-            DEFAULT_CHARGE_POWER,
-            DEFAULT_DISCHARGE_POWER,
-            DEFAULT_PRICE_OVERRIDE_THRESHOLD,
-            DEFAULT_QUIET_START,
-            DEFAULT_QUIET_END,
-            DEFAULT_TIME_OVERRIDE_START,
-            DEFAULT_TIME_OVERRIDE_END,
-            DEFAULT_CALCULATION_WINDOW_START,
-            DEFAULT_CALCULATION_WINDOW_END,
-            DEFAULT_BATTERY_MIN_SOC_DISCHARGE,
-            DEFAULT_BATTERY_MIN_SOC_AGGRESSIVE_DISCHARGE,
+        options = self.config_entry.options
+        if options is self._cached_options_ref:
+            return self._cached_config
+
+        _LOGGER.debug(
+            "Building config from options. calculation_window_enabled raw value: %s",
+            options.get('calculation_window_enabled', 'NOT SET'),
         )
 
-        options = self.config_entry.options
+        # Number, switch, then select and time values
+        config = {key: float(options.get(key, default)) for key, default in _NUMBER_FIELDS}
+        config.update((key, bool(options.get(key, default))) for key, default in _BOOL_FIELDS)
+        config.update((key, options.get(key, default)) for key, default in _RAW_FIELDS)
 
-        _LOGGER.debug(f"Building config from options. calculation_window_enabled raw value: {options.get('calculation_window_enabled', 'NOT SET')}")
-
-        # Number values with defaults
-        config = {
-            # Today's configuration
-            "charging_windows": float(options.get("charging_windows", DEFAULT_CHARGING_WINDOWS)),
-            "expensive_windows": float(options.get("expensive_windows", DEFAULT_EXPENSIVE_WINDOWS)),
-            "cheap_percentile": float(options.get("cheap_percentile", DEFAULT_CHEAP_PERCENTILE)),
-            "expensive_percentile": float(options.get("expensive_percentile", DEFAULT_EXPENSIVE_PERCENTILE)),
-            "min_spread": float(options.get("min_spread", DEFAULT_MIN_SPREAD)),
-            "min_spread_discharge": float(options.get("min_spread_discharge", DEFAULT_MIN_SPREAD_DISCHARGE)),
-            "aggressive_discharge_spread": float(options.get("aggressive_discharge_spread", DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD)),
-            "min_price_difference": float(options.get("min_price_difference", DEFAULT_MIN_PRICE_DIFFERENCE)),
-            "additional_cost": float(options.get("additional_cost", DEFAULT_ADDITIONAL_COST)),
-            "tax": float(options.get("tax", DEFAULT_TAX)),
-            "vat": float(options.get("vat", DEFAULT_VAT_RATE)),
-            "battery_rte": float(options.get("battery_rte", DEFAULT_BATTERY_RTE)),
-            "charge_power": float(options.get("charge_power", DEFAULT_CHARGE_POWER)),
-            "discharge_power": float(options.get("discharge_power", DEFAULT_DISCHARGE_POWER)),
-            "price_override_threshold": float(options.get("price_override_threshold", DEFAULT_PRICE_OVERRIDE_THRESHOLD)),
-            "battery_min_soc_discharge": float(options.get("battery_min_soc_discharge", DEFAULT_BATTERY_MIN_SOC_DISCHARGE)),
-            "battery_min_soc_aggressive_discharge": float(options.get("battery_min_soc_aggressive_discharge", DEFAULT_BATTERY_MIN_SOC_AGGRESSIVE_DISCHARGE)),
-
-            # Tomorrow's configuration
-            "charging_windows_tomorrow": float(options.get("charging_windows_tomorrow", DEFAULT_CHARGING_WINDOWS)),
-            "expensive_windows_tomorrow": float(options.get("expensive_windows_tomorrow", DEFAULT_EXPENSIVE_WINDOWS)),
-            "cheap_percentile_tomorrow": float(options.get("cheap_percentile_tomorrow", DEFAULT_CHEAP_PERCENTILE)),
-            "expensive_percentile_tomorrow": float(options.get("expensive_percentile_tomorrow", DEFAULT_EXPENSIVE_PERCENTILE)),
-            "min_spread_tomorrow": float(options.get("min_spread_tomorrow", DEFAULT_MIN_SPREAD)),
-            "min_spread_discharge_tomorrow": float(options.get("min_spread_discharge_tomorrow", DEFAULT_MIN_SPREAD_DISCHARGE)),
-            "aggressive_discharge_spread_tomorrow": float(options.get("aggressive_discharge_spread_tomorrow", DEFAULT_AGGRESSIVE_DISCHARGE_SPREAD)),
-            "min_price_difference_tomorrow": float(options.get("min_price_difference_tomorrow", DEFAULT_MIN_PRICE_DIFFERENCE)),
-            "price_override_threshold_tomorrow": float(options.get("price_override_threshold_tomorrow", DEFAULT_PRICE_OVERRIDE_THRESHOLD)),
-
-            # Boolean values (switches)
-            "automation_enabled": bool(options.get("automation_enabled", True)),
-            "tomorrow_settings_enabled": bool(options.get("tomorrow_settings_enabled", False)),
-            "midnight_rotation_notifications": bool(options.get("midnight_rotation_notifications", False)),
-            "notifications_enabled": bool(options.get("notifications_enabled", True)),
-            "quiet_hours_enabled": bool(options.get("quiet_hours_enabled", False)),
-            "price_override_enabled": bool(options.get("price_override_enabled", False)),
-            "price_override_enabled_tomorrow": bool(options.get("price_override_enabled_tomorrow", False)),
-            "time_override_enabled": bool(options.get("time_override_enabled", False)),
-            "time_override_enabled_tomorrow": bool(options.get("time_override_enabled_tomorrow", False)),
-            "calculation_window_enabled": bool(options.get("calculation_window_enabled", False)),
-            "calculation_window_enabled_tomorrow": bool(options.get("calculation_window_enabled_tomorrow", False)),
-            "notify_automation_disabled": bool(options.get("notify_automation_disabled", False)),
-            "notify_charging": bool(options.get("notify_charging", True)),
-            "notify_discharge": bool(options.get("notify_discharge", True)),
-            "notify_discharge_aggressive": bool(options.get("notify_discharge_aggressive", True)),
-            "notify_idle": bool(options.get("notify_idle", False)),
-
-            # String values (selects)
-            "pricing_window_duration": options.get("pricing_window_duration", "15_minutes"),
-            "time_override_mode": options.get("time_override_mode", "charge"),
-            "time_override_mode_tomorrow": options.get("time_override_mode_tomorrow", "charge"),
-
-            # Time values
-            "time_override_start": options.get("time_override_start", DEFAULT_TIME_OVERRIDE_START),
-            "time_override_end": options.get("time_override_end", DEFAULT_TIME_OVERRIDE_END),
-            "time_override_start_tomorrow": options.get("time_override_start_tomorrow", DEFAULT_TIME_OVERRIDE_START),
-            "time_override_end_tomorrow": options.get("time_override_end_tomorrow", DEFAULT_TIME_OVERRIDE_END),
-            "calculation_window_start": options.get("calculation_window_start", DEFAULT_CALCULATION_WINDOW_START),
-            "calculation_window_end": options.get("calculation_window_end", DEFAULT_CALCULATION_WINDOW_END),
-            "calculation_window_start_tomorrow": options.get("calculation_window_start_tomorrow", DEFAULT_CALCULATION_WINDOW_START),
-            "calculation_window_end_tomorrow": options.get("calculation_window_end_tomorrow", DEFAULT_CALCULATION_WINDOW_END),
-            "quiet_hours_start": options.get("quiet_hours_start", DEFAULT_QUIET_START),
-            "quiet_hours_end": options.get("quiet_hours_end", DEFAULT_QUIET_END),
-        }
+        # Battery powers in kW, as used by the cost calculations
+        config["charge_power_kw"] = config["charge_power"] / 1000
+        config["discharge_power_kw"] = config["discharge_power"] / 1000
 
+        self._cached_options_ref = options
+        self._cached_config = config
         return config
 
-    async def async_request_refresh(self) -> None:
-        """Request an immediate coordinator refresh."""
-        _LOGGER.debug("Refresh requested, executing immediately")
-        # Call the parent's async_refresh() to fetch new data and update sensors
-        await super(CEWCoordinator, self).async_refresh()
+    @callback
+    def async_schedule_settings_refresh(self) -> None:
+        """Request a refresh once a burst of setting changes has settled."""
+        self._settings_change_debouncer.async_schedule_call()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending refreshes."""
+        self._settings_change_debouncer.async_shutdown()
+        await super().async_shutdown()
 
     def get_config_value(self, key: str, default: Any = None) -> Any:
         """Get a configuration value from the coordinator data."""
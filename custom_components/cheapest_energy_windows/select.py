@@ -66,6 +66,11 @@ class CEWSelect(SelectEntity):
         self._attr_icon = icon
         self._attr_has_entity_name = False
 
+        # Whether changes need a recalculation, and the coordinator to ask
+        # for it (resolved on first use)
+        self._affects_calculation = key in CALCULATION_AFFECTING_KEYS
+        self._coordinator = None
+
         # Load value from config entry options, fallback to default
         self._attr_current_option = config_entry.options.get(key, default)
         if self._attr_current_option not in options:
@@ -82,27 +87,39 @@ class CEWSelect(SelectEntity):
             "sw_version": "1.0.0",
         }
 
+    def _get_coordinator(self):
+        """Return the coordinator of this entry, caching it once found."""
+        if self._coordinator is None:
+            self._coordinator = (
+                self.hass.data.get(DOMAIN, {})
+                .get(self._config_entry.entry_id, {})
+                .get("coordinator")
+            )
+        return self._coordinator
+
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        options = self._config_entry.options
+        if options.get(self._key) == option:
+            # Already stored, nothing to save or recalculate
+            return
+
         self._attr_current_option = option
 
         # Save to config entry options
-        new_options = dict(self._config_entry.options)
-        new_options[self._key] = option
         self.hass.config_entries.async_update_entry(
             self._config_entry,
-            options=new_options
+            options={**options, self._key: option}
         )
 
         self.async_write_ha_state()
 
         # Only trigger coordinator update for selects that affect calculations
         # Check against the centralized registry of calculation-affecting keys
-        if self._key in CALCULATION_AFFECTING_KEYS:
-            if DOMAIN in self.hass.data and self._config_entry.entry_id in self.hass.data[DOMAIN]:
-                coordinator = self.hass.data[DOMAIN][self._config_entry.entry_id].get("coordinator")
-                if coordinator:
-                    _LOGGER.debug(f"Select {self._key} affects calculations, triggering coordinator refresh")
-                    await coordinator.async_request_refresh()
+        if self._affects_calculation:
+            coordinator = self._get_coordinator()
+            if coordinator:
+                _LOGGER.debug(f"Select {self._key} affects calculations, scheduling coordinator refresh")
+                coordinator.async_schedule_settings_refresh()
         else:
             _LOGGER.debug(f"Select {self._key} doesn't affect calculations, skipping coordinator refresh")
\ No newline at end of file
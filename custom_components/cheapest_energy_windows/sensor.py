@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import uuid
 
 from homeassistant.components.sensor import (
@@ -11,8 +12,9 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
@@ -60,6 +62,54 @@ from .coordinator import CEWCoordinator
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+_RULE = "-" * 60
+
+# Config values that affect calculations (and the current state), hashed to
+# detect calculation-relevant config changes. Notification settings and
+# other non-calculation config are deliberately left out.
+_CALC_KEYS_UNSUFFIXED = (
+    "automation_enabled",
+    "vat",
+    "tax",
+    "additional_cost",
+    "battery_rte",
+    "charge_power",
+    "discharge_power",
+    "pricing_window_duration",
+)
+# Keys that have a "_tomorrow" variant when tomorrow settings are enabled
+_CALC_KEYS_SUFFIXED = (
+    "charging_windows",
+    "expensive_windows",
+    "cheap_percentile",
+    "expensive_percentile",
+    "min_spread",
+    "min_spread_discharge",
+    "aggressive_discharge_spread",
+    "min_price_difference",
+    "price_override_enabled",
+    "price_override_threshold",
+    # Calculation window settings affect what windows are selected
+    "calculation_window_enabled",
+    "calculation_window_start",
+    "calculation_window_end",
+    # Time overrides affect the current state
+    "time_override_enabled",
+    "time_override_start",
+    "time_override_end",
+    "time_override_mode",
+)
+# The coordinator builds every key, including the "_tomorrow" variants, so
+# the full key lists can be fixed up front
+_CALC_KEYS_TODAY = _CALC_KEYS_UNSUFFIXED + _CALC_KEYS_SUFFIXED
+_CALC_KEYS_TOMORROW = _CALC_KEYS_UNSUFFIXED + tuple(
+    f"{key}_tomorrow" for key in _CALC_KEYS_SUFFIXED
+)
+
+# Shared stand-in for "no calculation result" so repeated no-data updates
+# hit the attribute cache
+_NO_RESULT: Mapping[str, Any] = MappingProxyType({})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -69,9 +119,13 @@ async def async_setup_entry(
     """Set up Cheapest Energy Windows sensors."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
+    # The engine keeps today's and tomorrow's plans apart, so one instance
+    # can serve both window sensors
+    calculation_engine = WindowCalculationEngine()
+
     sensors = [
-        CEWTodaySensor(coordinator, config_entry),
-        CEWTomorrowSensor(coordinator, config_entry),
+        CEWTodaySensor(coordinator, config_entry, calculation_engine),
+        CEWTomorrowSensor(coordinator, config_entry, calculation_engine),
         CEWPriceSensorProxy(hass, coordinator, config_entry),
         CEWLastCalculationSensor(coordinator, config_entry),
     ]
@@ -87,11 +141,13 @@ class CEWBaseSensor(CoordinatorEntity, SensorEntity):
         coordinator: CEWCoordinator,
         config_entry: ConfigEntry,
         sensor_type: str,
+        calculation_engine: WindowCalculationEngine,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.config_entry = config_entry
         self._sensor_type = sensor_type
+        self._calculation_engine = calculation_engine
 
         # Set unique ID and name
         self._attr_unique_id = f"{PREFIX}{sensor_type}"
@@ -117,6 +173,18 @@ class CEWBaseSensor(CoordinatorEntity, SensorEntity):
         self._previous_automation_enabled = self._persistent_sensor_state["previous_automation_enabled"]
         self._previous_calc_config_hash = self._persistent_sensor_state["previous_calc_config_hash"]
 
+        # The coordinator hands out the same config dict until options
+        # change, so the last calculation config hash can be reused
+        self._cached_config_ref: Optional[Dict[str, Any]] = None
+        self._cached_is_tomorrow: Optional[bool] = None
+        self._cached_config_hash: Optional[int] = None
+
+        # Attributes built for the last calculation result; the engine returns
+        # the same result object when there is nothing new to report
+        self._last_result: Optional[Mapping[str, Any]] = None
+        self._last_result_config_update: Optional[datetime] = None
+        self._last_attributes: Optional[Dict[str, Any]] = None
+
     @property
     def device_info(self) -> Dict[str, Any]:
         """Return device information."""
@@ -128,114 +196,100 @@ class CEWBaseSensor(CoordinatorEntity, SensorEntity):
             "sw_version": "1.0.0",
         }
 
-    def _calc_config_hash(self, config: Dict[str, Any], is_tomorrow: bool = False) -> str:
+    def _calc_config_hash(self, config: Dict[str, Any], is_tomorrow: bool = False) -> int:
         """Create a hash of config values that affect calculations.
 
         Only includes values that impact window calculations and current state.
         Excludes notification settings and other non-calculation config.
         """
-        suffix = "_tomorrow" if is_tomorrow and config.get("tomorrow_settings_enabled", False) else ""
-
-        # Config values that affect calculations
-        calc_values = [
-            config.get("automation_enabled", True),
-            config.get(f"charging_windows{suffix}", 4),
-            config.get(f"expensive_windows{suffix}", 4),
-            config.get(f"cheap_percentile{suffix}", 25),
-            config.get(f"expensive_percentile{suffix}", 25),
-            config.get(f"min_spread{suffix}", 10),
-            config.get(f"min_spread_discharge{suffix}", 20),
-            config.get(f"aggressive_discharge_spread{suffix}", 40),
-            config.get(f"min_price_difference{suffix}", 0.05),
-            config.get("vat", 0.21),
-            config.get("tax", 0.12286),
-            config.get("additional_cost", 0.02398),
-            config.get("battery_rte", 90),
-            config.get("charge_power", 2400),
-            config.get("discharge_power", 2400),
-            config.get(f"price_override_enabled{suffix}", False),
-            config.get(f"price_override_threshold{suffix}", 0.15),
-            config.get("pricing_window_duration", "15_minutes"),
-            # Calculation window settings affect what windows are selected
-            config.get(f"calculation_window_enabled{suffix}", False),
-            config.get(f"calculation_window_start{suffix}", "00:00:00"),
-            config.get(f"calculation_window_end{suffix}", "23:59:59"),
-        ]
-
-        # Add time overrides (these affect current state)
-        calc_values.extend([
-            config.get(f"time_override_enabled{suffix}", False),
-            config.get(f"time_override_start{suffix}", "00:00:00"),
-            config.get(f"time_override_end{suffix}", "00:00:00"),
-            config.get(f"time_override_mode{suffix}", "charge"),
-        ])
-
-        # Create hash from all values
-        return str(hash(tuple(str(v) for v in calc_values)))
-
-
-class CEWTodaySensor(CEWBaseSensor):
-    """Sensor for today's energy windows."""
-
-    def __init__(self, coordinator: CEWCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize today sensor."""
-        super().__init__(coordinator, config_entry, "today")
-        self._calculation_engine = WindowCalculationEngine()
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _LOGGER.debug("-"*60)
-        _LOGGER.debug(f"SENSOR UPDATE: {self._sensor_type}")
-        _LOGGER.debug(f"Coordinator data exists: {self.coordinator.data is not None}")
+        if config is self._cached_config_ref and is_tomorrow == self._cached_is_tomorrow:
+            return self._cached_config_hash
+
+        use_tomorrow = is_tomorrow and config["tomorrow_settings_enabled"]
+        keys = _CALC_KEYS_TOMORROW if use_tomorrow else _CALC_KEYS_TODAY
+
+        # Values are primitives, so hash the tuple directly; anything
+        # unexpected is stringified so it can't make the tuple unhashable
+        config_hash = hash(tuple(
+            v if isinstance(v, (bool, int, float, str)) else str(v)
+            for v in map(config.__getitem__, keys)
+        ))
+
+        self._cached_config_ref = config
+        self._cached_is_tomorrow = is_tomorrow
+        self._cached_config_hash = config_hash
+        return config_hash
+
+    def _attributes_for(self, result: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return sensor attributes for a result, reusing them if it is unchanged."""
+        data = self.coordinator.data
+        last_config_update = data.get("last_config_update") if data else None
+        if result is self._last_result and last_config_update == self._last_result_config_update:
+            return self._last_attributes
+
+        attributes = self._build_attributes(result)
+        self._last_result = result
+        self._last_result_config_update = last_config_update
+        self._last_attributes = attributes
+        return attributes
+
+    def _process_update(
+        self,
+        raw_key: str,
+        is_tomorrow: bool,
+        valid_key: Optional[str] = None,
+    ) -> None:
+        """Recalculate windows from coordinator data and write any change."""
+        data = self.coordinator.data
+        label = self._sensor_type.title()
+        _LOGGER.debug("%s\nSENSOR UPDATE: %s", _RULE, self._sensor_type)
+        _LOGGER.debug("Coordinator data exists: %s", data is not None)
 
-        if not self.coordinator.data:
+        if not data:
             # No coordinator data - maintain previous state if we have one
             # This prevents brief unavailable states during updates
             if self._previous_state is not None:
-                _LOGGER.debug("No coordinator data, maintaining previous state")
+                _LOGGER.debug("%s: No coordinator data, maintaining previous state", label)
                 # Use previous values and skip write - sensor already has correct state
                 return
             else:
-                _LOGGER.debug("No coordinator data and no previous state, defaulting to OFF")
+                _LOGGER.debug("%s: No coordinator data and no previous state, defaulting to OFF", label)
                 new_state = STATE_OFF
                 new_attributes = {}
                 self._attr_native_value = new_state
                 self._attr_extra_state_attributes = new_attributes
                 self._previous_state = new_state
-                self._previous_attributes = new_attributes.copy() if new_attributes else None
+                self._previous_attributes = new_attributes
                 self.async_write_ha_state()
                 return
 
         # Layer 3: Check what changed
-        price_data_changed = self.coordinator.data.get("price_data_changed", True)
-        config_changed = self.coordinator.data.get("config_changed", False)
-        is_first_load = self.coordinator.data.get("is_first_load", False)
-        scheduled_update = self.coordinator.data.get("scheduled_update", False)
+        price_data_changed = data.get("price_data_changed", True)
+        config_changed = data.get("config_changed", False)
+        is_first_load = data.get("is_first_load", False)
+        scheduled_update = data.get("scheduled_update", False)
 
-        config = self.coordinator.data.get("config", {})
+        config = data["config"]
         current_automation_enabled = config.get("automation_enabled", True)
 
         # Check if calculation-affecting config changed
-        current_calc_config_hash = self._calc_config_hash(config, is_tomorrow=False)
+        current_calc_config_hash = self._calc_config_hash(config, is_tomorrow=is_tomorrow)
         calc_config_changed = (
             self._previous_calc_config_hash is None or
             self._previous_calc_config_hash != current_calc_config_hash
         )
 
-        _LOGGER.debug(f"Price data changed: {price_data_changed}")
-        _LOGGER.debug(f"Config changed: {config_changed}")
-        _LOGGER.debug(f"Is first load: {is_first_load}")
-        _LOGGER.debug(f"Scheduled update: {scheduled_update}")
-        _LOGGER.debug(f"Automation enabled: {current_automation_enabled} (was: {self._previous_automation_enabled})")
-        _LOGGER.debug(f"Calc config hash: {current_calc_config_hash} (was: {self._previous_calc_config_hash})")
-        _LOGGER.debug(f"Calc config changed: {calc_config_changed}")
-
-        # Check if automation_enabled changed - this requires recalculation
-        # Only detect change if we have a previous value (not on very first load)
-        automation_enabled_changed = (
-            self._previous_automation_enabled is not None and
-            self._previous_automation_enabled != current_automation_enabled
+        _LOGGER.debug(
+            "Price data changed: %s, config changed: %s, first load: %s, scheduled update: %s",
+            price_data_changed, config_changed, is_first_load, scheduled_update,
+        )
+        _LOGGER.debug(
+            "Automation enabled: %s (was: %s)",
+            current_automation_enabled, self._previous_automation_enabled,
+        )
+        _LOGGER.debug(
+            "Calc config hash: %s (was: %s), changed: %s",
+            current_calc_config_hash, self._previous_calc_config_hash, calc_config_changed,
         )
 
         # Only skip recalculation for non-calculation config changes
@@ -246,82 +300,113 @@ class CEWTodaySensor(CEWBaseSensor):
         # - Scheduled updates (needed for time-based state changes)
         if config_changed and not price_data_changed and not is_first_load and not calc_config_changed and not scheduled_update:
             # Non-calculation config change (notifications, etc.) - maintain current state
-            _LOGGER.debug("Non-calculation config change, skipping recalculation to prevent spurious state changes")
+            _LOGGER.debug("%s: Non-calculation config change, skipping recalculation to prevent spurious state changes", label)
             return
 
         if calc_config_changed:
-            _LOGGER.info(f"Calculation config changed, forcing recalculation")
+            _LOGGER.info("%s: Calculation config changed, forcing recalculation", label)
 
         if scheduled_update:
-            _LOGGER.debug("Scheduled update - recalculating for time-based state changes")
+            _LOGGER.debug("%s: Scheduled update - recalculating for time-based state changes", label)
 
         # On first load, we need to calculate to set initial state even though it's a config change
         if is_first_load:
-            _LOGGER.debug("First load - calculating initial state")
-
+            _LOGGER.debug("%s: First load - calculating initial state", label)
 
         # Price data changed OR first run - proceed with recalculation
-        raw_today = self.coordinator.data.get("raw_today", [])
-
-        _LOGGER.debug(f"Raw today length: {len(raw_today)}")
-        _LOGGER.debug(f"Config keys: {len(list(config.keys()))} items")
-        _LOGGER.debug(f"Automation enabled: {config.get('automation_enabled')}")
+        raw_prices = data.get(raw_key, [])
+        _LOGGER.debug("Raw %s length: %d", self._sensor_type, len(raw_prices))
 
         # Calculate windows and state
-        if raw_today:
+        if raw_prices and (valid_key is None or data.get(valid_key, False)):
             _LOGGER.debug("Calculating windows...")
 
-            result = self._calculation_engine.calculate_windows(
-                raw_today, config, is_tomorrow=False
-            )
+            calculate_windows = self._calculation_engine.calculate_windows
+            result = calculate_windows(raw_prices, config, is_tomorrow=is_tomorrow)
 
-            calculated_state = result.get("state", STATE_OFF)
-            _LOGGER.debug(f"Calculated state: {calculated_state}")
-            _LOGGER.debug(f"Charge windows: {len(result.get('cheapest_times', []))}")
-            _LOGGER.debug(f"Discharge windows: {len(result.get('expensive_times', []))}")
-
-            new_state = calculated_state
-            new_attributes = self._build_attributes(result)
+            new_state = result.get("state", STATE_OFF)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Calculated state: %s, charge windows: %d, discharge windows: %d",
+                    new_state,
+                    len(result.get("cheapest_times", [])),
+                    len(result.get("expensive_times", [])),
+                )
+
+            new_attributes = self._attributes_for(result)
         else:
-            # No data available
-            automation_enabled = config.get("automation_enabled", True)
-            state = STATE_OFF if not automation_enabled else STATE_IDLE
-            _LOGGER.debug(f"No raw_today data, setting state to: {state}")
-
-            new_state = state
-            new_attributes = self._build_attributes({})
+            new_state, new_attributes = self._no_data_result(config)
+            _LOGGER.debug("No %s data, setting state to: %s", raw_key, new_state)
 
-        # Only update if state or attributes have changed
+        # Only update if state or attributes have changed; reused attributes
+        # are the same object, so skip the deep comparison for them
         state_changed = new_state != self._previous_state
-        attributes_changed = new_attributes != self._previous_attributes
+        attributes_changed = (
+            new_attributes is not self._previous_attributes
+            and new_attributes != self._previous_attributes
+        )
 
         if state_changed or attributes_changed:
             if state_changed:
-                _LOGGER.info(f"State changed: {self._previous_state} → {new_state}")
+                _LOGGER.info("%s state changed: %s → %s", label, self._previous_state, new_state)
             else:
-                _LOGGER.debug("Attributes changed, updating sensor")
+                _LOGGER.debug("%s: Attributes changed, updating sensor", label)
 
             self._attr_native_value = new_state
             self._attr_extra_state_attributes = new_attributes
             self._previous_state = new_state
-            self._previous_attributes = new_attributes.copy() if new_attributes else None
-            self._previous_automation_enabled = current_automation_enabled
-            self._previous_calc_config_hash = current_calc_config_hash
-            self._persistent_sensor_state["previous_automation_enabled"] = current_automation_enabled
-            self._persistent_sensor_state["previous_calc_config_hash"] = current_calc_config_hash
-
-            _LOGGER.debug(f"Final state: {self._attr_native_value}")
-            _LOGGER.debug("-"*60)
+            self._previous_attributes = new_attributes
+            self._track_calc_inputs(current_automation_enabled, current_calc_config_hash)
+
+            _LOGGER.debug("Final state: %s\n%s", self._attr_native_value, _RULE)
             self.async_write_ha_state()
         else:
-            _LOGGER.debug("No changes detected, maintaining current state")
+            _LOGGER.debug("%s: No changes detected, maintaining current state", label)
             # Still update tracking even if state didn't change
-            self._previous_automation_enabled = current_automation_enabled
-            self._previous_calc_config_hash = current_calc_config_hash
-            self._persistent_sensor_state["previous_automation_enabled"] = current_automation_enabled
-            self._persistent_sensor_state["previous_calc_config_hash"] = current_calc_config_hash
+            self._track_calc_inputs(current_automation_enabled, current_calc_config_hash)
+
+    def _track_calc_inputs(self, automation_enabled: bool, calc_config_hash: int) -> None:
+        """Remember the calculation inputs, persisting only values that changed."""
+        if automation_enabled != self._previous_automation_enabled:
+            self._previous_automation_enabled = automation_enabled
+            self._persistent_sensor_state["previous_automation_enabled"] = automation_enabled
+        if calc_config_hash != self._previous_calc_config_hash:
+            self._previous_calc_config_hash = calc_config_hash
+            self._persistent_sensor_state["previous_calc_config_hash"] = calc_config_hash
+
+    def _no_data_result(self, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Return the state and attributes to use without price data."""
+        raise NotImplementedError
+
+    def _build_attributes(self, result: Mapping[str, Any]) -> Dict[str, Any]:
+        """Build sensor attributes from calculation result."""
+        raise NotImplementedError
+
 
-    def _build_attributes(self, result: Dict[str, Any]) -> Dict[str, Any]:
+class CEWTodaySensor(CEWBaseSensor):
+    """Sensor for today's energy windows."""
+
+    def __init__(
+        self,
+        coordinator: CEWCoordinator,
+        config_entry: ConfigEntry,
+        calculation_engine: WindowCalculationEngine,
+    ) -> None:
+        """Initialize today sensor."""
+        super().__init__(coordinator, config_entry, "today", calculation_engine)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._process_update("raw_today", is_tomorrow=False)
+
+    def _no_data_result(self, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Return the state and attributes to use without price data."""
+        automation_enabled = config.get("automation_enabled", True)
+        state = STATE_OFF if not automation_enabled else STATE_IDLE
+        return state, self._attributes_for(_NO_RESULT)
+
+    def _build_attributes(self, result: Mapping[str, Any]) -> Dict[str, Any]:
         """Build sensor attributes from calculation result."""
         # Get last config update time from coordinator data
         last_config_update = self.coordinator.data.get("last_config_update") if self.coordinator.data else None
@@ -361,107 +446,26 @@ class CEWTodaySensor(CEWBaseSensor):
 class CEWTomorrowSensor(CEWBaseSensor):
     """Sensor for tomorrow's energy windows."""
 
-    def __init__(self, coordinator: CEWCoordinator, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        coordinator: CEWCoordinator,
+        config_entry: ConfigEntry,
+        calculation_engine: WindowCalculationEngine,
+    ) -> None:
         """Initialize tomorrow sensor."""
-        super().__init__(coordinator, config_entry, "tomorrow")
-        self._calculation_engine = WindowCalculationEngine()
+        super().__init__(coordinator, config_entry, "tomorrow", calculation_engine)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if not self.coordinator.data:
-            # No coordinator data - maintain previous state if we have one
-            if self._previous_state is not None:
-                _LOGGER.debug("No coordinator data, maintaining previous tomorrow state")
-                return
-            else:
-                new_state = STATE_OFF
-                new_attributes = {}
-                self._attr_native_value = new_state
-                self._attr_extra_state_attributes = new_attributes
-                self._previous_state = new_state
-                self._previous_attributes = new_attributes.copy() if new_attributes else None
-                self.async_write_ha_state()
-                return
+        self._process_update("raw_tomorrow", is_tomorrow=True, valid_key="tomorrow_valid")
 
-        # Layer 3: Check what changed
-        price_data_changed = self.coordinator.data.get("price_data_changed", True)
-        config_changed = self.coordinator.data.get("config_changed", False)
-        is_first_load = self.coordinator.data.get("is_first_load", False)
-        scheduled_update = self.coordinator.data.get("scheduled_update", False)
+    def _no_data_result(self, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Return the state and attributes to use without price data."""
+        # No tomorrow data yet (Nordpool publishes after 13:00 CET)
+        return STATE_OFF, {}
 
-        config = self.coordinator.data.get("config", {})
-        current_automation_enabled = config.get("automation_enabled", True)
-
-        # Check if calculation-affecting config changed
-        current_calc_config_hash = self._calc_config_hash(config, is_tomorrow=True)
-        calc_config_changed = (
-            self._previous_calc_config_hash is None or
-            self._previous_calc_config_hash != current_calc_config_hash
-        )
-
-        # Only skip recalculation for non-calculation config changes
-        # Always recalculate for scheduled updates (needed for time-based state changes)
-        if config_changed and not price_data_changed and not is_first_load and not calc_config_changed and not scheduled_update:
-            _LOGGER.debug("Tomorrow: Non-calculation config change, skipping recalculation")
-            return
-
-        if calc_config_changed:
-            _LOGGER.info(f"Tomorrow: Calculation config changed, forcing recalculation")
-
-        if scheduled_update:
-            _LOGGER.debug("Tomorrow: Scheduled update - recalculating for time-based state changes")
-
-        # On first load, calculate to set initial state
-        if is_first_load:
-            _LOGGER.debug("Tomorrow: First load - calculating initial state")
-
-        # Price data changed OR first run - proceed with recalculation
-        tomorrow_valid = self.coordinator.data.get("tomorrow_valid", False)
-        raw_tomorrow = self.coordinator.data.get("raw_tomorrow", [])
-
-        if tomorrow_valid and raw_tomorrow:
-            # Calculate tomorrow's windows
-            result = self._calculation_engine.calculate_windows(
-                raw_tomorrow, config, is_tomorrow=True
-            )
-
-            # Get calculated state from result (like today sensor does)
-            new_state = result.get("state", STATE_OFF)
-            new_attributes = self._build_attributes(result)
-        else:
-            # No tomorrow data yet (Nordpool publishes after 13:00 CET)
-            new_state = STATE_OFF
-            new_attributes = {}
-
-        # Only update if state or attributes have changed
-        state_changed = new_state != self._previous_state
-        attributes_changed = new_attributes != self._previous_attributes
-
-        if state_changed or attributes_changed:
-            if state_changed:
-                _LOGGER.info(f"Tomorrow state changed: {self._previous_state} → {new_state}")
-            else:
-                _LOGGER.debug("Tomorrow attributes changed, updating sensor")
-
-            self._attr_native_value = new_state
-            self._attr_extra_state_attributes = new_attributes
-            self._previous_state = new_state
-            self._previous_attributes = new_attributes.copy() if new_attributes else None
-            self._previous_automation_enabled = current_automation_enabled
-            self._previous_calc_config_hash = current_calc_config_hash
-            self._persistent_sensor_state["previous_automation_enabled"] = current_automation_enabled
-            self._persistent_sensor_state["previous_calc_config_hash"] = current_calc_config_hash
-            self.async_write_ha_state()
-        else:
-            _LOGGER.debug("No changes in tomorrow sensor, maintaining current state")
-            # Still update tracking even if state didn't change
-            self._previous_automation_enabled = current_automation_enabled
-            self._previous_calc_config_hash = current_calc_config_hash
-            self._persistent_sensor_state["previous_automation_enabled"] = current_automation_enabled
-            self._persistent_sensor_state["previous_calc_config_hash"] = current_calc_config_hash
-
-    def _build_attributes(self, result: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_attributes(self, result: Mapping[str, Any]) -> Dict[str, Any]:
         """Build sensor attributes for tomorrow."""
         # Get last config update time from coordinator data
         last_config_update = self.coordinator.data.get("last_config_update") if self.coordinator.data else None
@@ -512,6 +516,11 @@ class CEWPriceSensorProxy(SensorEntity):
         self._attr_native_value = None
         self._attr_extra_state_attributes = {}
 
+        # Text entity holding the configured price sensor; its state is
+        # tracked instead of looked up on every coordinator update
+        self._price_sensor_text_id = f"text.{PREFIX}price_sensor_entity"
+        self._price_sensor_text: Optional[State] = None
+
         _LOGGER.debug("Price sensor proxy initialized")
 
     @property
@@ -598,7 +607,7 @@ class CEWPriceSensorProxy(SensorEntity):
             return
 
         # Get the configured price sensor entity_id
-        price_sensor_entity = self.hass.states.get(f"text.{PREFIX}price_sensor_entity")
+        price_sensor_entity = self._price_sensor_text
         if not price_sensor_entity:
             _LOGGER.warning("Price sensor entity text input not found")
             return
@@ -623,24 +632,39 @@ class CEWPriceSensorProxy(SensorEntity):
         sensor_format = self._detect_sensor_format(price_sensor.attributes)
 
         if sensor_format == "entsoe":
-            _LOGGER.debug(f"Detected ENTSO-E format from {price_sensor_id}, normalizing to Nord Pool format")
+            _LOGGER.debug("Detected ENTSO-E format from %s, normalizing to Nord Pool format", price_sensor_id)
             self._attr_extra_state_attributes = self._normalize_entsoe_to_nordpool(price_sensor.attributes)
         elif sensor_format == "nordpool":
-            _LOGGER.debug(f"Detected Nord Pool format from {price_sensor_id}, passing through")
+            _LOGGER.debug("Detected Nord Pool format from %s, passing through", price_sensor_id)
             self._attr_extra_state_attributes = dict(price_sensor.attributes)
         else:
             _LOGGER.warning(f"Unknown price sensor format from {price_sensor_id}, passing through as-is")
             self._attr_extra_state_attributes = dict(price_sensor.attributes)
 
-        _LOGGER.debug(f"Proxy sensor updated from {price_sensor_id}, state: {self._attr_native_value}")
+        _LOGGER.debug("Proxy sensor updated from %s, state: %s", price_sensor_id, self._attr_native_value)
         self.async_write_ha_state()
 
+    @callback
+    def _handle_price_sensor_text_change(self, event: Event) -> None:
+        """Track the configured price sensor and mirror the new one."""
+        self._price_sensor_text = event.data.get("new_state")
+        self._handle_coordinator_update()
+
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
-        # Subscribe to coordinator updates
+        self._price_sensor_text = self.hass.states.get(self._price_sensor_text_id)
+
+        # Subscribe to coordinator updates and price sensor selection changes
         self.async_on_remove(
             self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._price_sensor_text_id],
+                self._handle_price_sensor_text_change,
+            )
+        )
 
         # Do initial update
         self._handle_coordinator_update()
@@ -685,21 +709,25 @@ class CEWLastCalculationSensor(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return
 
         # Only update when calculations actually change
         # Coordinator polls every 10s for state transitions, but this sensor
         # only updates when price data changes or config changes to avoid
         # unnecessary chart refreshes
-        price_data_changed = self.coordinator.data.get("price_data_changed", False)
-        config_changed = self.coordinator.data.get("config_changed", False)
+        price_data_changed = data.get("price_data_changed", False)
+        config_changed = data.get("config_changed", False)
 
         if price_data_changed or config_changed:
             # Actual calculation occurred - generate new unique value
             self._attr_native_value = str(uuid.uuid4())[:8]
             self.async_write_ha_state()
-            _LOGGER.debug(f"Last calculation updated: {self._attr_native_value} (price_changed={price_data_changed}, config_changed={config_changed})")
+            _LOGGER.debug(
+                "Last calculation updated: %s (price_changed=%s, config_changed=%s)",
+                self._attr_native_value, price_data_changed, config_changed,
+            )
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
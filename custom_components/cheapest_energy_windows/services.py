@@ -1,12 +1,13 @@
 """Services for Cheapest Energy Windows."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
 import yaml
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, State
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
@@ -23,6 +24,56 @@ _LOGGER = logging.getLogger(LOGGER_NAME)
 # Service schemas
 SERVICE_ROTATE_SCHEMA = vol.Schema({})
 
+# Settings rotated by the rotate_tomorrow_settings service as
+# (tomorrow_key, today_key) pairs, grouped by entity platform
+_ROTATE_NUMBER_SETTINGS = (
+    # Window counts
+    ("charging_windows_tomorrow", "charging_windows"),
+    ("expensive_windows_tomorrow", "expensive_windows"),
+    # Percentiles
+    ("cheap_percentile_tomorrow", "cheap_percentile"),
+    ("expensive_percentile_tomorrow", "expensive_percentile"),
+    # Spreads
+    ("min_spread_tomorrow", "min_spread"),
+    ("min_spread_discharge_tomorrow", "min_spread_discharge"),
+    ("aggressive_discharge_spread_tomorrow", "aggressive_discharge_spread"),
+    ("min_price_difference_tomorrow", "min_price_difference"),
+    # Price override
+    ("price_override_threshold_tomorrow", "price_override_threshold"),
+)
+
+_ROTATE_BOOLEAN_SETTINGS = (
+    ("price_override_enabled_tomorrow", "price_override_enabled"),
+    ("time_override_enabled_tomorrow", "time_override_enabled"),
+    ("calculation_window_enabled_tomorrow", "calculation_window_enabled"),
+)
+
+_ROTATE_SELECT_SETTINGS = (
+    ("time_override_mode_tomorrow", "time_override_mode"),
+)
+
+_ROTATE_TIME_SETTINGS = (
+    ("time_override_start_tomorrow", "time_override_start"),
+    ("time_override_end_tomorrow", "time_override_end"),
+    ("calculation_window_start_tomorrow", "calculation_window_start"),
+    ("calculation_window_end_tomorrow", "calculation_window_end"),
+)
+
+# Map battery mode to the text entity holding its configured action
+_MODE_ACTION_ENTITIES = {
+    "idle": f"text.{PREFIX}battery_idle_action",
+    "charge": f"text.{PREFIX}battery_charge_action",
+    "discharge": f"text.{PREFIX}battery_discharge_action",
+    "aggressive_discharge": f"text.{PREFIX}battery_aggressive_discharge_action",
+    "off": f"text.{PREFIX}battery_off_action",
+}
+
+
+def _is_rotated(hass: HomeAssistant, today_entity: str, tomorrow_state: State) -> bool:
+    """Return True if the today entity already holds the tomorrow value."""
+    today_state = hass.states.get(today_entity)
+    return today_state is not None and today_state.state == tomorrow_state.state
+
 
 async def async_create_notification_automation(hass: HomeAssistant) -> tuple[bool, str]:
     """Create the notification automation in automations.yaml.
@@ -272,107 +323,86 @@ async def async_create_notification_automation(hass: HomeAssistant) -> tuple[boo
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for Cheapest Energy Windows."""
+    # Services are domain-wide; a second config entry (or a concurrent setup)
+    # must not register them again
+    if hass.services.has_service(DOMAIN, SERVICE_ROTATE_SETTINGS):
+        return
 
     async def handle_rotate_settings(call: ServiceCall) -> None:
         """Handle the rotate_settings service call."""
         _LOGGER.info("Rotating tomorrow settings to today")
 
-        # List of settings to rotate
-        settings_to_rotate = [
-            # Window counts
-            ("charging_windows_tomorrow", "charging_windows"),
-            ("expensive_windows_tomorrow", "expensive_windows"),
-            # Percentiles
-            ("cheap_percentile_tomorrow", "cheap_percentile"),
-            ("expensive_percentile_tomorrow", "expensive_percentile"),
-            # Spreads
-            ("min_spread_tomorrow", "min_spread"),
-            ("min_spread_discharge_tomorrow", "min_spread_discharge"),
-            ("aggressive_discharge_spread_tomorrow", "aggressive_discharge_spread"),
-            ("min_price_difference_tomorrow", "min_price_difference"),
-            # Price override
-            ("price_override_threshold_tomorrow", "price_override_threshold"),
-        ]
+        # Each rotated setting targets a different entity, so the service
+        # calls are independent and can run concurrently
+        calls = []
 
         # Rotate number settings
-        for tomorrow_key, today_key in settings_to_rotate:
+        for tomorrow_key, today_key in _ROTATE_NUMBER_SETTINGS:
             tomorrow_entity = f"number.{PREFIX}{tomorrow_key}"
             today_entity = f"number.{PREFIX}{today_key}"
 
             tomorrow_state = hass.states.get(tomorrow_entity)
-            if tomorrow_state:
-                await hass.services.async_call(
+            if tomorrow_state and not _is_rotated(hass, today_entity, tomorrow_state):
+                calls.append(hass.services.async_call(
                     "number",
                     "set_value",
                     {"entity_id": today_entity, "value": float(tomorrow_state.state)},
                     blocking=True,
-                )
-                _LOGGER.debug(f"Rotated {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
+                ))
+                _LOGGER.debug(f"Rotating {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
 
         # Rotate boolean settings
-        boolean_settings = [
-            ("price_override_enabled_tomorrow", "price_override_enabled"),
-            ("time_override_enabled_tomorrow", "time_override_enabled"),
-            ("calculation_window_enabled_tomorrow", "calculation_window_enabled"),
-        ]
-
-        for tomorrow_key, today_key in boolean_settings:
+        for tomorrow_key, today_key in _ROTATE_BOOLEAN_SETTINGS:
             tomorrow_entity = f"switch.{PREFIX}{tomorrow_key}"
             today_entity = f"switch.{PREFIX}{today_key}"
 
             tomorrow_state = hass.states.get(tomorrow_entity)
-            if tomorrow_state:
+            if tomorrow_state and not _is_rotated(hass, today_entity, tomorrow_state):
                 service = "turn_on" if tomorrow_state.state == "on" else "turn_off"
-                await hass.services.async_call(
+                calls.append(hass.services.async_call(
                     "switch",
                     service,
                     {"entity_id": today_entity},
                     blocking=True,
-                )
-                _LOGGER.debug(f"Rotated {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
+                ))
+                _LOGGER.debug(f"Rotating {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
 
         # Rotate select settings
-        select_settings = [
-            ("time_override_mode_tomorrow", "time_override_mode"),
-        ]
-
-        for tomorrow_key, today_key in select_settings:
+        for tomorrow_key, today_key in _ROTATE_SELECT_SETTINGS:
             tomorrow_entity = f"select.{PREFIX}{tomorrow_key}"
             today_entity = f"select.{PREFIX}{today_key}"
 
             tomorrow_state = hass.states.get(tomorrow_entity)
-            if tomorrow_state:
-                await hass.services.async_call(
+            if tomorrow_state and not _is_rotated(hass, today_entity, tomorrow_state):
+                calls.append(hass.services.async_call(
                     "select",
                     "select_option",
                     {"entity_id": today_entity, "option": tomorrow_state.state},
                     blocking=True,
-                )
-                _LOGGER.debug(f"Rotated {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
+                ))
+                _LOGGER.debug(f"Rotating {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
 
         # Rotate datetime settings
-        datetime_settings = [
-            ("time_override_start_tomorrow", "time_override_start"),
-            ("time_override_end_tomorrow", "time_override_end"),
-            ("calculation_window_start_tomorrow", "calculation_window_start"),
-            ("calculation_window_end_tomorrow", "calculation_window_end"),
-        ]
-
-        for tomorrow_key, today_key in datetime_settings:
+        for tomorrow_key, today_key in _ROTATE_TIME_SETTINGS:
             tomorrow_entity = f"time.{PREFIX}{tomorrow_key}"
             today_entity = f"time.{PREFIX}{today_key}"
 
             tomorrow_state = hass.states.get(tomorrow_entity)
-            if tomorrow_state:
-                await hass.services.async_call(
+            if tomorrow_state and not _is_rotated(hass, today_entity, tomorrow_state):
+                calls.append(hass.services.async_call(
                     "time",
                     "set_value",
                     {"entity_id": today_entity, "time": tomorrow_state.state},
                     blocking=True,
-                )
-                _LOGGER.debug(f"Rotated {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
+                ))
+                _LOGGER.debug(f"Rotating {tomorrow_key} -> {today_key}: {tomorrow_state.state}")
 
-        # Fire event
+        if calls:
+            await asyncio.gather(*calls)
+        else:
+            _LOGGER.debug("Today settings already match tomorrow, nothing to rotate")
+
+        # Fire event only once all settings are rotated, listeners read them
         hass.bus.async_fire(EVENT_SETTINGS_ROTATED, {})
 
         _LOGGER.info("Settings rotation complete")
@@ -381,16 +411,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         """Handle triggering battery mode actions."""
         mode = call.data.get("mode")
 
-        # Map mode to text entity
-        mode_entity_map = {
-            "idle": f"text.{PREFIX}battery_idle_action",
-            "charge": f"text.{PREFIX}battery_charge_action",
-            "discharge": f"text.{PREFIX}battery_discharge_action",
-            "aggressive_discharge": f"text.{PREFIX}battery_aggressive_discharge_action",
-            "off": f"text.{PREFIX}battery_off_action",
-        }
-
-        text_entity = mode_entity_map.get(mode)
+        text_entity = _MODE_ACTION_ENTITIES.get(mode)
         if not text_entity:
             _LOGGER.error(f"Invalid mode: {mode}")
             return